@@ -0,0 +1,367 @@
+"""
+End-to-end rerun benchmarks for both language pages.
+
+Drives each page headless through Streamlit's AppTest harness with Gemini,
+Nominatim and Overpass stubbed out (Overpass is a local HTTP server, so the
+real client, streaming parser and ranking run). Scenarios:
+
+    load            first run of the page
+    analyze_images  upload 4 images and analyze them
+    symptom_check   describe symptoms and run the checker
+    history         render the page with 500 history and tracker entries
+    search          search for providers (3000 Overpass elements)
+
+Every page/scenario runs in a fresh interpreter and reports the number of
+full script runs the interaction caused, the time of each run, the total
+time (median of --repeat passes) and peak memory: the Python heap peak of the
+interaction under tracemalloc (a separate pass, so it doesn't skew the
+timings) and the process's peak RSS.
+
+    python benchmarks/e2e.py                   # run and print the results
+    python benchmarks/e2e.py --write           # also store them as e2e_baseline.json
+    python benchmarks/e2e.py compare           # flag regressions against the baseline
+    python benchmarks/e2e.py -k search         # only matching scenarios
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from micro import environment, format_seconds, sample_history, sample_image, sample_overpass_elements
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = Path(__file__).with_name("e2e_baseline.json")
+
+PAGES = ["pages/English.py", "pages/हिन्दी.py"]
+
+# Relative slowdown (time) or growth (traced memory) reported as a regression
+DEFAULT_THRESHOLD = 0.25
+
+DEFAULT_REPEAT = 3
+
+RESULT_MARKER = "@@e2e-result@@"
+
+HISTORY_SIZE = 500
+IMAGE_COUNT = 4
+OVERPASS_ELEMENTS = 3000
+
+GEMINI_REPLIES = {
+    "pages/English.py": (
+        "## Preliminary Assessment\nMild redness.\n\n## Possible Conditions\n- Yeast infection (likely)\n"
+        "- Contact dermatitis\n\n## Recommended Steps\nKeep the area dry.\n\nSeverity rating: 3\n"
+    ),
+    "pages/हिन्दी.py": (
+        "## प्रारंभिक मूल्यांकन\nहल्की लालिमा।\n\n## संभावित स्थितियां\n- यीस्ट संक्रमण (संभावित)\n"
+        "- संपर्क त्वचाशोथ\n\n## अनुशंसित कदम\nक्षेत्र को सूखा रखें।\n\nगंभीरता रेटिंग: 3\n"
+    ),
+}
+
+# Widgets each scenario drives, per page (buttons by label, or by key where the page sets one)
+WIDGETS = {
+    "pages/English.py": {
+        "analyze": "Generate Private Analysis for All Images",
+        "symptoms": "Describe your symptoms in detail:",
+        "check": "Check Symptoms",
+        "city": None,
+        "search": "healthcare_search_button",
+    },
+    "pages/हिन्दी.py": {
+        "analyze": "analyze_button",
+        "symptoms": "अपने लक्षणों का विस्तार से वर्णन करें...",
+        "check": "लक्षणों का विश्लेषण करें",
+        "city": "अपना शहर या पिन कोड दर्ज करें",
+        "search": "खोजें",
+    },
+}
+
+
+# Stubs (child process only)
+
+class GeminiCalls:
+    count = 0
+
+
+def install_stubs(page):
+    """Replace Gemini and Nominatim and start a local Overpass server"""
+    import http.server
+    import threading
+
+    body = json.dumps({"elements": sample_overpass_elements(OVERPASS_ELEMENTS)}).encode()
+
+    class OverpassHandler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), OverpassHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OVERPASS_MIRRORS"] = f"http://127.0.0.1:{server.server_port}/api/interpreter"
+    os.environ.pop("OVERPASS_LOCAL_URL", None)
+
+    import geopy.geocoders
+
+    class Location:
+        latitude, longitude, address = 28.6, 77.2, "New Delhi, Delhi, India"
+
+    geopy.geocoders.Nominatim.geocode = lambda self, query, **kwargs: Location()
+
+    import google.generativeai as genai
+
+    class Response:
+        text = GEMINI_REPLIES[page]
+
+        def resolve(self):
+            # Multi-image batches stream their responses
+            pass
+
+    def generate_content(self, contents, **kwargs):
+        GeminiCalls.count += 1
+        return Response()
+
+    genai.GenerativeModel.generate_content = generate_content
+
+    # Every pass should pay for the model call, not hit the previous pass's cached result
+    os.environ["YSHY_SYMPTOM_CACHE_SIZE"] = "0"
+
+
+class RunCounter:
+    """Counts full script runs through the page's call to yshy.profiler.start_profile"""
+
+    def __init__(self):
+        import yshy.profiler
+
+        self.starts = []
+        original = yshy.profiler.start_profile
+
+        def start_profile(page):
+            self.starts.append(time.perf_counter())
+            return original(page)
+
+        yshy.profiler.start_profile = start_profile
+
+    def run_times(self, started, finished):
+        starts = [start for start in self.starts if start >= started]
+        return [end - start for start, end in zip(starts, starts[1:] + [finished])]
+
+
+# Scenarios: (setup, act, check) run on a fresh AppTest
+
+def load(at, widgets):
+    at.run()
+
+
+def seed_history(at, widgets):
+    history = sample_history(HISTORY_SIZE)
+    at.session_state["history"] = history
+    at.session_state["symptom_tracker"] = [
+        {"date": entry["timestamp"], "condition": condition, "severity": entry.get("severity") or entry.get("combined_severity")}
+        for entry in history for condition in (entry.get("conditions") or entry.get("all_conditions") or [])
+    ]
+    at.run()
+
+
+def find_button(at, key_or_label):
+    for button in at.button:
+        if key_or_label in (button.key, button.label):
+            return button
+    raise LookupError(f"No button {key_or_label!r}")
+
+
+def analyze_images(at, widgets):
+    # Distinct photos, so none is skipped as a near-duplicate
+    images = [(f"photo_{i}.jpg", sample_image(1280, 960, seed=i), "image/jpeg") for i in range(IMAGE_COUNT)]
+    at.file_uploader[0].set_value(images).run()
+    find_button(at, widgets["analyze"]).click().run()
+
+
+def symptom_check(at, widgets):
+    next(t for t in at.text_area if t.label == widgets["symptoms"]).input(
+        "Itching, redness and a thick white discharge for the past three days").run()
+    find_button(at, widgets["check"]).click().run()
+
+
+def search(at, widgets):
+    if widgets["city"]:
+        next(t for t in at.text_input if t.label == widgets["city"]).input("110001").run()
+    find_button(at, widgets["search"]).click().run()
+
+
+def found_providers(at):
+    return bool(at.session_state["found_providers"]) if "found_providers" in at.session_state else \
+        any("किमी" in expander.label for expander in at.expander)
+
+
+SCENARIOS = {
+    "load": (None, load, lambda at, calls: True),
+    "analyze_images": (load, analyze_images, lambda at, calls: calls == IMAGE_COUNT and len(at.session_state["history"]) == 1),
+    "symptom_check": (load, symptom_check, lambda at, calls: calls == 1 and len(at.session_state["history"]) == 1),
+    "history": (None, seed_history, lambda at, calls: len(at.session_state["history"]) == HISTORY_SIZE),
+    "search": (load, search, lambda at, calls: found_providers(at)),
+}
+
+
+def measure(page, scenario, trace_memory):
+    from streamlit.testing.v1 import AppTest
+
+    setup, act, check = SCENARIOS[scenario]
+    widgets = WIDGETS[page]
+    at = AppTest.from_file(str(ROOT / page), default_timeout=120)
+    if setup:
+        setup(at, widgets)
+
+    counter = RUN_COUNTER
+    GeminiCalls.count = 0
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    act(at, widgets)
+    finished = time.perf_counter()
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if at.exception:
+        raise RuntimeError(f"{page} {scenario}: {at.exception[0].message}")
+    if not check(at, GeminiCalls.count):
+        raise RuntimeError(f"{page} {scenario}: the scenario did not complete")
+    return finished - started, counter.run_times(started, finished), peak
+
+
+def child(page, scenario, repeat):
+    global RUN_COUNTER
+    install_stubs(page)
+    RUN_COUNTER = RunCounter()
+
+    passes = [measure(page, scenario, trace_memory=False) for _ in range(repeat)]
+    _, _, peak_traced = measure(page, scenario, trace_memory=True)
+    median_pass = sorted(passes, key=lambda p: p[0])[len(passes) // 2]
+
+    result = {
+        "total_s": statistics.median(p[0] for p in passes),
+        "runs": len(median_pass[1]),
+        "run_s": median_pass[1],
+        "peak_traced_mb": peak_traced / 2**20,
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10),
+    }
+    print(RESULT_MARKER + json.dumps(result))
+
+
+# Parent
+
+def run_child(page, scenario, repeat):
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    for name in ["YSHY_PROFILE", "YSHY_METRICS_PORT", "YSHY_METRICS_FILE"]:
+        env.pop(name, None)
+    result = subprocess.run(
+        [sys.executable, __file__, "--child", page, scenario, "--repeat", str(repeat)],
+        cwd=ROOT, env=env, capture_output=True, text=True, encoding="utf-8",
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"{page} {scenario} failed:\n{result.stderr[-2000:]}")
+
+
+def describe(name, result):
+    runs = ", ".join(format_seconds(seconds) for seconds in result["run_s"])
+    return (f"  {name:<36} {format_seconds(result['total_s']):>10}  {result['runs']} run(s) [{runs}]  "
+            f"heap peak {result['peak_traced_mb']:.1f} MB, RSS {result['peak_rss_mb']:.0f} MB")
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"  {name:<36} new")
+            continue
+        time_ratio = result["total_s"] / previous["total_s"]
+        memory_ratio = result["peak_traced_mb"] / max(previous["peak_traced_mb"], 1e-9)
+        problems = []
+        if time_ratio > 1 + threshold:
+            problems.append("slower")
+        if memory_ratio > 1 + threshold:
+            problems.append("more memory")
+        if result["runs"] > previous["runs"]:
+            problems.append("more script runs")
+        if problems:
+            regressions.append(name)
+        print(f"  {name:<36} time {time_ratio:5.2f}x  heap {memory_ratio:5.2f}x  runs {previous['runs']} -> {result['runs']}"
+              f"  {'REGRESSION (' + ', '.join(problems) + ')' if problems else 'ok'}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["run", "compare"], default="run")
+    parser.add_argument("-k", dest="keyword", help="only run page/scenario names containing KEYWORD")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed passes per scenario")
+    parser.add_argument("--write", action="store_true", help=f"store the results in {BASELINE_FILE.name}")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--child", nargs=2, metavar=("PAGE", "SCENARIO"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.repeat)
+        return 0
+
+    baseline = None
+    if args.command == "compare":
+        if not BASELINE_FILE.exists():
+            print(f"No baseline at {BASELINE_FILE}; run with --write first")
+            return 2
+        baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+        if baseline["environment"] != environment():
+            print(f"Warning: baseline was recorded on {baseline['environment']}, timings may not be comparable")
+
+    print(f"Python {platform.python_version()}, {sys.platform}")
+    results = {}
+    for page in PAGES:
+        for scenario in SCENARIOS:
+            name = f"{page}::{scenario}"
+            if args.keyword and args.keyword not in name:
+                continue
+            results[name] = run_child(page, scenario, args.repeat)
+            print(describe(name, results[name]))
+
+    status = 0
+    if baseline is not None:
+        print(f"\nAgainst {BASELINE_FILE.name} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            status = 1
+
+    if args.write:
+        if args.keyword and BASELINE_FILE.exists():
+            merged = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))["results"]
+            merged.update(results)
+            results = merged
+        BASELINE_FILE.write_text(json.dumps({
+            "recorded": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "results": results,
+        }, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
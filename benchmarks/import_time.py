@@ -0,0 +1,118 @@
+"""
+Cold page-load import benchmark.
+
+Runs each page once in a fresh interpreter under ``python -X importtime``
+(through Streamlit's AppTest harness) and reports the modules the page pulls
+in on top of Streamlit itself. Exits non-zero when a page goes over its
+budget in import_budget.json or imports a module that should only be loaded
+on first use.
+
+    python benchmarks/import_time.py            # print the report
+    python benchmarks/import_time.py --write    # also refresh import_time_report.txt
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+REPORT_FILE = Path(__file__).with_name("import_time_report.txt")
+
+START_MARKER = "@@page-start@@"
+END_MARKER = "@@page-end@@"
+
+# Streamlit imports some of its own dependencies on first use of an element
+# (numpy and PIL for st.image, the emoji table for page_icon). A warm-up script
+# touches those first so only the modules the page itself pulls in are counted.
+WARM_UP = "\\n".join([
+    "import streamlit as st",
+    "st.set_page_config(page_icon='🩺')",
+    "st.image('https://example.com/icon.png')",
+    "st.write('warm-up')",
+])
+
+RUNNER = f"""
+import sys
+from streamlit.testing.v1 import AppTest
+
+AppTest.from_string("{WARM_UP}").run()
+page = AppTest.from_file(sys.argv[1], default_timeout=120)
+sys.stderr.write("{START_MARKER}\\n")
+sys.stderr.flush()
+page.run()
+sys.stderr.write("{END_MARKER}\\n")
+sys.exit(1 if page.exception else 0)
+"""
+
+
+def parse_importtime(stderr):
+    """Return (name, depth, self_us, cumulative_us) for imports between the markers"""
+    records = []
+    recording = False
+    for line in stderr.splitlines():
+        if line.strip() == START_MARKER:
+            recording = True
+            continue
+        if line.strip() == END_MARKER:
+            break
+        if not recording or not line.startswith("import time:") or "imported package" in line:
+            continue
+        # "import time:   self |   cumulative |   <2 spaces per nesting level>name"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def measure_page(page):
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUNNER, str(ROOT / page)],
+        cwd=ROOT, env=env, capture_output=True, text=True, encoding="utf-8",
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{page} failed to load:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def page_report(page, records, budget_ms, deferred):
+    top_level = [record for record in records if record[1] == 0]
+    total_ms = sum(record[3] for record in top_level) / 1000
+    loaded_early = sorted({name.split(".")[0] for name, *_ in records} & set(deferred))
+
+    lines = [f"{page}: {total_ms:.1f} ms in {len(records)} imports (budget {budget_ms} ms)"]
+    for name, _, _, cumulative_us in sorted(top_level, key=lambda record: -record[3])[:15]:
+        lines.append(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    if loaded_early:
+        lines.append(f"  loaded at startup but should be deferred: {', '.join(loaded_early)}")
+
+    ok = total_ms <= budget_ms and not loaded_early
+    return lines, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--write", action="store_true", help=f"write the report to {REPORT_FILE.name}")
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_FILE.read_text(encoding="utf-8"))
+    report = [f"Python {sys.version.split()[0]}, {sys.platform}", ""]
+    all_ok = True
+    for page, budget_ms in budget["max_import_ms"].items():
+        lines, ok = page_report(page, measure_page(page), budget_ms, budget["deferred_modules"])
+        report.extend(lines + [""])
+        all_ok = all_ok and ok
+
+    print("\n".join(report))
+    if args.write:
+        REPORT_FILE.write_text("\n".join(report), encoding="utf-8")
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Micro-benchmarks for the pure hot paths of the shared core.
+
+Each case is timed with timeit (autoranged, best-of and median of several
+repeats) on synthetic, seeded inputs: image watermarking across image sizes,
+severity/condition parsing over a corpus of sample Gemini replies, trend
+DataFrame + statistics on histories of 10 to 100k entries, Overpass
+normalization and provider ranking, history export/import and the Symptom
+Checker cache's similarity lookup.
+
+    python benchmarks/micro.py                     # run and print the results
+    python benchmarks/micro.py --write             # also store them as micro_baseline.json
+    python benchmarks/micro.py compare             # run and flag regressions against the baseline
+    python benchmarks/micro.py compare -k trend    # only cases whose name contains "trend"
+
+Baselines are only comparable on the same machine and Python version;
+compare warns when they differ.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BASELINE_FILE = Path(__file__).with_name("micro_baseline.json")
+
+# A case regresses when its median is this much slower than the baseline
+DEFAULT_THRESHOLD = 0.25
+
+REPEAT = 5
+
+SEED = 20240601
+
+CONDITIONS = {
+    "en": ["Yeast infection", "Bacterial vaginosis", "Contact dermatitis", "Folliculitis",
+           "Genital herpes", "Lichen sclerosus", "Bartholin's cyst", "HPV warts"],
+    "hi": ["यीस्ट संक्रमण", "बैक्टीरियल वेजिनोसिस", "संपर्क त्वचाशोथ", "फॉलिकुलिटिस",
+           "जननांग हर्पीस", "लाइकेन स्क्लेरोसस"],
+}
+
+
+# Inputs
+
+def sample_image(width, height, seed=None):
+    """A plain JPEG; with a `seed`, random blocks make images of different seeds look different"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(SEED)
+    image = Image.new("RGB", (width, height), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    if seed is not None:
+        rng = random.Random(seed)
+        draw = ImageDraw.Draw(image)
+        for _ in range(12):
+            x, y = rng.randrange(width), rng.randrange(height)
+            draw.rectangle((x, y, x + width // 4, y + height // 4),
+                           fill=(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def sample_replies(count):
+    """Gemini-style replies in both languages, with the list styles the parser accepts"""
+    from yshy.i18n import get_catalog
+
+    rng = random.Random(SEED)
+    replies = []
+    for i in range(count):
+        language = "en" if i % 3 else "hi"
+        catalog = get_catalog(language)
+        conditions = rng.sample(CONDITIONS[language], rng.randint(1, 3))
+        style = rng.choice(["- {}", "* **{}**", "{n}. {} (likely)"])
+        items = "\n".join(style.format(name, n=n) for n, name in enumerate(conditions, 1))
+        label = catalog.get('analysis.severity_labels')[0].title()
+        filler = "Observation details and guidance. " * rng.randint(5, 40)
+        replies.append((language, (
+            f"## Preliminary Assessment\n{filler}\n\n"
+            f"## {catalog('analysis.conditions_heading')}\n{items}\n\n"
+            f"## Condition Details\n{filler}\n\n"
+            f"## Recommended Steps\n{filler}\n\n"
+            f"{label}: {rng.randint(1, 5)}\n"
+        )))
+    return replies
+
+
+def sample_history(size):
+    rng = random.Random(SEED)
+    start = datetime(2024, 1, 1)
+    history = []
+    for i in range(size):
+        timestamp = (start + timedelta(minutes=37 * i)).isoformat()
+        conditions = rng.sample(CONDITIONS["en"], rng.randint(0, 3))
+        if i % 2:
+            history.append({
+                "id": f"{i:012x}", "timestamp": timestamp, "type": "multi_image_analysis",
+                "image_count": 1, "analyses": [], "combined_severity": rng.randint(1, 5),
+                "all_conditions": conditions,
+            })
+        else:
+            history.append({
+                "id": f"{i:012x}", "timestamp": timestamp, "type": "symptom_check",
+                "analysis": "Symptom analysis text. " * 20, "symptom_text": "itching and redness",
+                "conditions": conditions, "severity": rng.randint(1, 5),
+            })
+    return history
+
+
+def sample_overpass_elements(count, lat=28.6, lon=77.2):
+    """Nodes and ways shaped like an Overpass response, including unusable ones"""
+    rng = random.Random(SEED)
+    amenities = ["hospital", "clinic", "doctors", "pharmacy"]
+    elements = []
+    for i in range(count):
+        tags = {"amenity": rng.choice(amenities), "name": f"Provider {i}", "addr:street": "MG Road",
+                "phone": "+91 11 2345 6789", "source": "survey", "wheelchair": "yes"}
+        if i % 20 == 0:
+            tags["name"] = "yes"
+        position = {"lat": lat + rng.uniform(-0.3, 0.3), "lon": lon + rng.uniform(-0.3, 0.3)}
+        if i % 4 == 0:
+            elements.append({"type": "way", "id": i, "center": position, "tags": tags})
+        else:
+            elements.append({"type": "node", "id": i, **position, "tags": tags})
+    return elements
+
+
+# Cases
+
+def image_cases():
+    from yshy.images import anonymize_image, image_hash, near_duplicates, prepare_image
+
+    for width, height in [(320, 240), (1280, 960), (4000, 3000)]:
+        image_bytes = sample_image(width, height)
+        yield f"anonymize_image[{width}x{height}]", lambda image_bytes=image_bytes: anonymize_image(image_bytes, "YSHY PRIVATE")
+        yield f"prepare_image[{width}x{height}]", lambda image_bytes=image_bytes: prepare_image(image_bytes, "image/png")
+        yield f"image_hash[{width}x{height}]", lambda image_bytes=image_bytes: image_hash(image_bytes)
+
+    hashes = [image_hash(sample_image(320 + number, 240)) for number in range(10)]
+    yield "near_duplicates[10]", lambda: near_duplicates(hashes)
+
+
+def parsing_cases():
+    from yshy.analysis import extract_conditions, extract_severity
+    from yshy.i18n import get_catalog
+
+    replies = [(get_catalog(language), text) for language, text in sample_replies(200)]
+
+    def parse_all():
+        for catalog, text in replies:
+            extract_severity(text, catalog)
+            extract_conditions(text, catalog)
+
+    yield "parse_replies[200]", parse_all
+
+
+def trend_cases():
+    from yshy.history import calculate_trend_stats, history_trend_data
+    from yshy.i18n import get_catalog
+
+    catalog = get_catalog("en")
+    for size in [10, 1_000, 10_000, 100_000]:
+        history = sample_history(size)
+        yield f"trend_data+stats[{size}]", lambda history=history: calculate_trend_stats(history_trend_data(history, catalog))
+
+
+def locator_cases():
+    from yshy.locator import iter_candidates, rank_providers
+
+    for count in [1_000, 10_000, 50_000]:
+        elements = sample_overpass_elements(count)
+        candidates = list(iter_candidates(elements))
+        yield f"normalize_elements[{count}]", lambda elements=elements: list(iter_candidates(elements))
+        yield f"rank_providers[{count}]", lambda candidates=candidates: rank_providers(
+            candidates, 28.6, 77.2, 15, "New Delhi", "Delhi", limit=100)
+
+
+def history_file_cases():
+    from yshy.history import export_history, import_history
+
+    for size in [100, 10_000]:
+        state = {"session_id": "benchmark", "history": sample_history(size), "symptom_tracker": [], "history_file": None}
+        encoded = export_history(state)
+        yield f"export_history[{size}]", lambda state=state: export_history(state)
+        yield f"import_history[{size}]", lambda encoded=encoded: import_history({}, encoded)
+
+
+def symptom_cache_cases():
+    from yshy.symptom_cache import SymptomCache, symptom_key
+
+    rng = random.Random(SEED)
+    words = ["itching", "redness", "burning", "discharge", "odor", "pain", "swelling", "sores",
+             "no", "mild", "severe", "after", "since", "when", "urinating", "days", "week"]
+    for size in [16, 256]:
+        cache = SymptomCache(size, similarity=0.9)
+        for i in range(size):
+            cache.put(symptom_key("en", " ".join(rng.choices(words, k=20)), "4-7 days", "Mild"),
+                      {"analysis": "", "conditions": []})
+        query = symptom_key("en", " ".join(rng.choices(words, k=20)), "4-7 days", "Mild")
+        yield f"symptom_cache_similar[{size}]", lambda cache=cache, query=query: cache.get(query)
+
+
+SUITES = [image_cases, parsing_cases, trend_cases, locator_cases, history_file_cases, symptom_cache_cases]
+
+
+# Running and comparing
+
+def time_case(func):
+    """Seconds per call: best and median over REPEAT autoranged runs"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=REPEAT, number=number)]
+    return {"median_s": statistics.median(per_call), "min_s": min(per_call), "number": number, "repeat": REPEAT}
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def run_cases(keyword=None):
+    results = {}
+    for suite in SUITES:
+        for name, func in suite():
+            if keyword and keyword not in name:
+                continue
+            results[name] = time_case(func)
+            print(f"  {name:<32} {format_seconds(results[name]['median_s']):>10}  (best {format_seconds(results[name]['min_s'])})")
+    return results
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline; returns the names of the regressed cases"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"  {name:<32} new")
+            continue
+        ratio = result["median_s"] / previous["median_s"]
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        print(f"  {name:<32} {format_seconds(previous['median_s']):>10} -> {format_seconds(result['median_s']):>10}  {ratio:5.2f}x  {verdict}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["run", "compare"], default="run")
+    parser.add_argument("-k", dest="keyword", help="only run cases whose name contains KEYWORD")
+    parser.add_argument("--write", action="store_true", help=f"store the results in {BASELINE_FILE.name}")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown of the median reported as a regression (default %(default)s)")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.command == "compare":
+        if not BASELINE_FILE.exists():
+            print(f"No baseline at {BASELINE_FILE}; run with --write first")
+            return 2
+        baseline = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+        if baseline["environment"] != environment():
+            print(f"Warning: baseline was recorded on {baseline['environment']}, timings may not be comparable")
+
+    print(f"Python {platform.python_version()}, {sys.platform}")
+    results = run_cases(args.keyword)
+
+    status = 0
+    if baseline is not None:
+        print(f"\nAgainst {BASELINE_FILE.name} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            status = 1
+
+    if args.write:
+        if args.keyword and BASELINE_FILE.exists():
+            # Partial runs only refresh the cases they ran
+            merged = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))["results"]
+            merged.update(results)
+            results = merged
+        BASELINE_FILE.write_text(json.dumps({
+            "recorded": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(),
+            "results": results,
+        }, indent=2) + "\n", encoding="utf-8")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Shared backend helpers for the YSHY Streamlit pages"""
@@ -0,0 +1,325 @@
+"""Gemini analysis pipeline shared by every language: model calls and response parsing"""
+import re
+import threading
+import time
+from collections import namedtuple
+
+from yshy.content import get_content
+from yshy.i18n import get_catalog
+from yshy.keypool import pool_from_environment
+from yshy.limiter import BATCH, INTERACTIVE, is_overload_error, limiter_from_environment
+from yshy.metrics import inc, timed
+from yshy.singleflight import SingleFlight, fingerprint
+from yshy.symptom_cache import cache_from_environment
+from yshy.tiers import MODEL_TIERS, TierRouter, is_upstream_error
+from yshy.tokens import PREFLIGHT_ENABLED, OutputBudget, combine_usage, record_estimate, record_usage, response_usage
+
+# Configure the model with appropriate settings for medical analysis
+GENERATION_CONFIG = {
+    "temperature": 0.2,  # Lower temperature for more reliable medical information
+    "top_p": 0.95,
+    "top_k": 64,
+    "response_mime_type": "text/plain",
+}
+
+# Used when a response does not state a severity rating
+DEFAULT_SEVERITY = 1
+
+# Content block holding each kind's system instruction
+SYSTEM_PROMPTS = {
+    'image': 'image_analysis_prompt',
+    'symptom': 'symptom_check_prompt',
+}
+
+# google-generativeai versions whose GenerativeModel is known to call Gemini
+# through its _client attribute, which is how each API key gets its own client
+GENAI_CLIENT_VERSIONS = ((0, 5), (1, 0))
+
+# A model call's outcome: response text (or None), the tier that answered and its token usage
+Generation = namedtuple("Generation", ["text", "model_tier", "tokens"])
+
+_models = {}
+_clients = {}
+_models_lock = threading.Lock()
+
+# Model tier for each call, skipping tiers that have been slow or failing
+_router = TierRouter()
+
+# Output token cap per task and language, following the sizes of recent responses
+_output_budget = OutputBudget()
+
+# API keys the calls are spread over; built on first use, after the pages have loaded .env
+_key_pool = None
+
+# Identical requests in flight at the same time (double clicks, two tabs) share one call
+_in_flight = SingleFlight()
+
+# Concurrent Gemini calls across all sessions, adapted to latency and 429/503 responses
+_gemini_limiter = limiter_from_environment("gemini")
+
+# Symptom check results by session and canonical input (None when disabled)
+_symptom_cache = cache_from_environment()
+
+
+def key_pool():
+    global _key_pool
+    with _models_lock:
+        if _key_pool is None:
+            _key_pool = pool_from_environment()
+        return _key_pool
+
+
+def use_client(model, service_client):
+    """
+    Make `model` call Gemini through `service_client`. The library has no
+    public way to do this, so it is only done on the versions it is known to
+    work on, and fails loudly anywhere else rather than using the wrong key.
+    """
+    from importlib.metadata import version
+
+    installed = version("google-generativeai")
+    release = tuple(int(part) for part in re.findall(r"\d+", installed)[:2])
+    minimum, below = GENAI_CLIENT_VERSIONS
+    if not minimum <= release < below:
+        raise RuntimeError(
+            f"google-generativeai {installed} is not supported: per-key clients need a version from "
+            f"{'.'.join(map(str, minimum))} up to (not including) {'.'.join(map(str, below))}")
+    if not hasattr(model, "_client"):
+        raise RuntimeError(f"google-generativeai {installed}: GenerativeModel no longer has a _client to set")
+    model._client = service_client
+
+
+def get_model(language, kind, tier, api_key):
+    """
+    The `tier` model for `kind` requests in a language, with the task's prompt
+    as its system instruction and calling Gemini with `api_key`. Built once
+    per content version on first use; google.generativeai is only imported
+    here.
+    """
+    content = get_content(language)
+    model_key = (language, content.digest, kind, tier, api_key.name)
+    with _models_lock:
+        if model_key not in _models:
+            import google.generativeai as genai
+            from google.ai import generativelanguage
+
+            if api_key.name not in _clients:
+                # genai.configure() sets one key for the whole process, so each key gets its own client
+                _clients[api_key.name] = generativelanguage.GenerativeServiceClient(
+                    client_options={"api_key": api_key.key})
+            profile = MODEL_TIERS[tier]
+            model = genai.GenerativeModel(
+                model_name=profile["model_name"],
+                generation_config={**GENERATION_CONFIG, "max_output_tokens": profile["max_output_tokens"]},
+                system_instruction=content.text(SYSTEM_PROMPTS[kind]),
+            )
+            use_client(model, _clients[api_key.name])
+            _models[model_key] = model
+        return _models[model_key]
+
+
+def generate(kind, language, contents, key, priority=INTERACTIVE, session=None, on_stage=None):
+    """
+    Generation for `contents` from the tier the router picks for `kind`,
+    capped at the task's output budget; the task's prompt is sent as the
+    system instruction. Concurrent calls with the same key share one model
+    call, and every call waits for a slot under the adaptive limit, served by
+    `priority` and fairly across sessions. A 429/503 is retried once on each
+    other API key that is not cooling down, and a response cut off by the
+    adaptive output cap is asked for once more at the tier's maximum. With
+    `on_stage`, the caller hears when the request is sent ("uploading") and
+    when the model starts answering ("generating").
+    """
+    def call():
+        pool = key_pool()
+        tier = _router.choose(kind)
+        ceiling = MODEL_TIERS[tier]["max_output_tokens"]
+        tried = []
+        # Tokens of an earlier, truncated response to the same request
+        spent = None
+        while True:
+            cap = ceiling if spent is not None else _output_budget.cap(kind, language, ceiling)
+            # Tier latency starts once a slot is held, so queueing does not count against the tier
+            started = None
+            try:
+                with _gemini_limiter.slot(kind, priority, session), timed("gemini_generate", kind=kind, tier=tier):
+                    # Charged to the key's per-minute budget only once the call can go out
+                    api_key = pool.acquire(exclude=tried)
+                    tried.append(api_key)
+                    model = get_model(language, kind, tier, api_key)
+                    if PREFLIGHT_ENABLED:
+                        preflight_tokens(model, contents, kind, tier)
+                    started = time.perf_counter()
+                    response = send(model, contents, cap, on_stage)
+                    response_text = response.text if response else None
+            except Exception as e:
+                if started is not None:
+                    pool.report(api_key, e)
+                    _router.record(tier, time.perf_counter() - started, failed=is_upstream_error(e))
+                if is_overload_error(e) and any(other not in tried for other in pool.available()):
+                    continue
+                raise
+            pool.report(api_key)
+            _router.record(tier, time.perf_counter() - started, failed=False)
+
+            prompt_tokens, output_tokens, truncated = response_usage(response)
+            if output_tokens is not None:
+                _output_budget.record(kind, language, output_tokens, truncated, cap)
+            tokens = record_usage(kind, tier, prompt_tokens, output_tokens, truncated)
+            if spent is not None:
+                tokens = combine_usage(spent, tokens)
+            elif truncated and cap < ceiling:
+                # Cut off by the adaptive cap rather than the model's limit; worth one more call
+                spent = tokens
+                tried = []
+                continue
+            return Generation(response_text, tier, tokens)
+
+    result, shared = _in_flight.do((kind, language, key), call)
+    if shared:
+        inc('yshy_coalesced_requests_total', kind=kind)
+        # The tokens were spent on the leader's request
+        result = result._replace(tokens={"prompt": 0, "output": 0})
+    return result
+
+
+def send(model, contents, cap, on_stage=None):
+    """generate_content(); streamed when the caller follows the stages, to tell sending from generating"""
+    generation_config = {"max_output_tokens": cap}
+    if on_stage is None:
+        return model.generate_content(contents, generation_config=generation_config)
+    on_stage("uploading")
+    # Returns with the first chunk, once the request has been read and the answer has begun
+    response = model.generate_content(contents, generation_config=generation_config, stream=True)
+    on_stage("generating")
+    response.resolve()
+    return response
+
+
+def preflight_tokens(model, contents, kind, tier):
+    """Record count_tokens()'s estimate of the prompt; the estimate is advisory, so failures are only timed"""
+    try:
+        with timed("gemini_count_tokens", kind=kind, tier=tier):
+            prompt_tokens = model.count_tokens(contents).total_tokens
+    except Exception:
+        return
+    record_estimate(kind, tier, prompt_tokens)
+
+
+def normalize_symptom_text(text):
+    """Case- and whitespace-insensitive form of a symptom description"""
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def extract_severity(response_text, catalog):
+    """Severity rating (1-5) stated in the response, checked from most to least severe"""
+    lowered = response_text.lower()
+    labels = catalog.get('analysis.severity_labels')
+    for level in range(5, 0, -1):
+        if any(f"{label}: {level}" in lowered for label in labels):
+            return level
+    return DEFAULT_SEVERITY
+
+
+def extract_conditions(response_text, catalog):
+    """Condition names listed under the response's 'Possible Conditions' section"""
+    heading = f"## {catalog('analysis.conditions_heading')}"
+    if heading not in response_text:
+        return []
+
+    section = response_text.split(heading, 1)[1].split("##")[0]
+    conditions = []
+    for line in section.strip().split("\n"):
+        line = line.strip()
+        # Only list items: "- name", "* name" or "1. name"
+        if not line.startswith(("-", "*")) and not line[:1].isdigit():
+            continue
+        condition = line.lstrip("0123456789.)-* ").replace("*", "").split("(")[0].strip()
+        if condition and condition not in conditions:
+            conditions.append(condition)
+    return conditions
+
+
+def analyze_image(image_bytes, mime_type, image_name, number, count, language, session=None, on_stage=None,
+                  priority=None):
+    """
+    Analyze one image of an upload and parse severity and conditions from the
+    response. The request carries only the image and a short per-image note.
+    Images of a multi-image batch queue behind interactive requests, unless
+    another `priority` is given.
+    `on_stage(stage)` is told when the image is uploading, generating and parsing.
+    """
+    catalog = get_catalog(language)
+    note = catalog('analysis.multi_image_note', number=number, count=count)
+
+    generation = generate('image', language, [{"mime_type": mime_type, "data": image_bytes}, note],
+                          fingerprint(get_content(language).digest, mime_type, image_bytes, note),
+                          priority=priority if priority is not None else INTERACTIVE if count == 1 else BATCH,
+                          session=session, on_stage=on_stage)
+    response_text = generation.text
+    if response_text is None:
+        raise RuntimeError("No response from the model")
+
+    if on_stage is not None:
+        on_stage("parsing")
+    with timed("parse_response", kind="image"):
+        severity = extract_severity(response_text, catalog)
+        conditions = extract_conditions(response_text, catalog)
+    return {
+        "image_name": image_name,
+        "image_number": number,
+        "analysis": response_text,
+        "severity": severity,
+        "conditions": conditions,
+        "model_tier": generation.model_tier,
+        "tokens": generation.tokens,
+    }
+
+
+def check_symptoms(symptom_info, language, cache_key=None, session=None):
+    """
+    Run the symptom checker prompt and parse the conditions from the response.
+    With a `cache_key` from symptom_cache.symptom_key(), an earlier result for
+    the same (or, if enabled, a near-identical) input in the same session is
+    returned instead.
+    """
+    if cache_key is not None:
+        cache_key = cache_key._replace(session=session)
+    if cache_key is not None and _symptom_cache is not None:
+        result, match = _symptom_cache.get(cache_key)
+        inc('yshy_symptom_cache_total', result=match or "miss")
+        if result is not None:
+            # Served without a model call
+            result["tokens"] = {"prompt": 0, "output": 0}
+            return result
+
+    catalog = get_catalog(language)
+    generation = generate('symptom', language, [symptom_info],
+                          fingerprint(get_content(language).digest, normalize_symptom_text(symptom_info)),
+                          session=session)
+    response_text = generation.text
+    if response_text is None:
+        return None
+
+    with timed("parse_response", kind="symptom"):
+        conditions = extract_conditions(response_text, catalog)
+    result = {
+        "analysis": response_text,
+        "conditions": conditions,
+        "model_tier": generation.model_tier,
+        "tokens": generation.tokens,
+    }
+    if cache_key is not None and _symptom_cache is not None:
+        _symptom_cache.put(cache_key, result)
+    return result
+
+
+def combine_image_analyses(analyses):
+    """Highest severity and every distinct condition across the analyzed images"""
+    combined_severity = max([DEFAULT_SEVERITY] + [analysis['severity'] for analysis in analyses])
+    all_conditions = []
+    for analysis in analyses:
+        for condition in analysis['conditions']:
+            if condition not in all_conditions:
+                all_conditions.append(condition)
+    return combined_severity, all_conditions
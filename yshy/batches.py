@@ -0,0 +1,157 @@
+"""
+Per-image checkpoints of multi-image analyses, kept under the session's
+anonymous id. A batch interrupted by a rerun, a disconnect or a failed image
+resumes from its first unfinished image, and its history entry is written
+only once every image has a result.
+
+Each image is analyzed in a worker thread that checkpoints its own result,
+so a rerun raised in the script thread while it waits cannot throw away a
+response that has already been paid for; the resumed run waits for the same
+worker instead of calling the model again.
+"""
+import concurrent.futures
+import contextvars
+import threading
+import time
+
+from yshy.singleflight import fingerprint
+
+# Checkpoints of batches untouched for this long are dropped
+CHECKPOINT_TTL_SECONDS = 60 * 60
+
+# How often the script thread wakes up while an image is being analyzed
+WAIT_INTERVAL_SECONDS = 0.25
+
+# (session id, batch id) -> (last update, {image number: analysis})
+_checkpoints = {}
+# (session id, batch id, image number) -> Future of an analysis still running
+_running = {}
+_lock = threading.Lock()
+
+
+def batch_id(language, files):
+    """Identifies a batch by its language and the names and contents of its files, in order"""
+    return fingerprint(language, *(part for file in files for part in (file.name, file.getvalue())))
+
+
+def _expire(now):
+    for key in [key for key, (updated, _) in _checkpoints.items() if now - updated >= CHECKPOINT_TTL_SECONDS]:
+        del _checkpoints[key]
+
+
+def completed_images(session_id, batch):
+    """The analyses already checkpointed for a batch, by image number"""
+    with _lock:
+        _, results = _checkpoints.get((session_id, batch), (None, {}))
+        return dict(results)
+
+
+def save_image(session_id, batch, analysis):
+    with _lock:
+        now = time.monotonic()
+        _expire(now)
+        _, results = _checkpoints.get((session_id, batch), (None, {}))
+        results[analysis["image_number"]] = analysis
+        _checkpoints[(session_id, batch)] = (now, results)
+
+
+def clear_batch(session_id, batch):
+    with _lock:
+        _checkpoints.pop((session_id, batch), None)
+
+
+def start_batch(state, batch):
+    """Mark the batch as requested; it keeps running on later reruns until it finishes or fails"""
+    state['pending_batch'] = batch
+
+
+def batch_pending(state, batch):
+    return state.get('pending_batch') == batch
+
+
+def _start_image(session_id, batch, number, file, analyze):
+    """The running analysis of an image, started in a worker thread unless one already is"""
+    key = (session_id, batch, number)
+    with _lock:
+        future = _running.get(key)
+        if future is not None:
+            return future
+        future = _running[key] = concurrent.futures.Future()
+
+    def work():
+        try:
+            analysis = analyze(number, file)
+        except BaseException as e:
+            with _lock:
+                del _running[key]
+            future.set_exception(e)
+            return
+        save_image(session_id, batch, analysis)
+        with _lock:
+            del _running[key]
+        future.set_result(analysis)
+
+    # Keep the page's metric labels on the worker's stage timings
+    threading.Thread(target=contextvars.copy_context().run, args=(work,), daemon=True,
+                     name=f"yshy-batch-image-{number}").start()
+    return future
+
+
+def _wait(future, on_wait):
+    while True:
+        try:
+            return future.result(timeout=WAIT_INTERVAL_SECONDS)
+        except concurrent.futures.TimeoutError:
+            if on_wait is not None:
+                on_wait()
+
+
+def analyze_batch(state, batch, files, analyze, on_error=None, on_result=None, skip=(), on_wait=None):
+    """
+    Run `analyze(number, file)` for each image of the batch without a
+    checkpointed result, checkpointing each result as it completes. Returns
+    the analyses of all images in order once every image has one. Images
+    numbered in `skip` (near-duplicates of another image) are left out.
+    `on_result(number, analysis)` is called for each checkpointed result and
+    then for each new one as it completes.
+
+    `analyze` runs in a worker thread, so it must not call Streamlit; the
+    script thread calls `on_wait()` every WAIT_INTERVAL_SECONDS while it
+    waits, to redraw progress.
+
+    A failure stops the batch, keeping the finished images for the next
+    attempt; with `on_error(number, error)` the other images still run (unless
+    it re-raises the error) and None is returned. Either way the batch is no
+    longer pending, so it is only retried when requested again.
+    """
+    session_id = state['session_id']
+    results = {number: analysis for number, analysis in completed_images(session_id, batch).items()
+               if number not in skip}
+    if on_result is not None:
+        for number in sorted(results):
+            on_result(number, results[number])
+    try:
+        for number, file in enumerate(files, 1):
+            if number in results or number in skip:
+                continue
+            try:
+                results[number] = _wait(_start_image(session_id, batch, number, file, analyze), on_wait)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(number, e)
+                continue
+            if on_result is not None:
+                on_result(number, results[number])
+    except Exception:
+        state['pending_batch'] = None
+        raise
+    # Streamlit's rerun and stop signals are BaseExceptions and skip this,
+    # leaving the batch pending so the next run resumes it
+    state['pending_batch'] = None
+
+    wanted = [number for number in range(1, len(files) + 1) if number not in skip]
+    if any(number not in results for number in wanted):
+        return None
+    clear_batch(session_id, batch)
+    return [results[number] for number in wanted]
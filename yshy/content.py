@@ -0,0 +1,128 @@
+"""Static page content (Education, FAQ, resource lists, CSS) loaded from the content bundle"""
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+
+CONTENT_DIR = Path(__file__).resolve().parent.parent / "content"
+
+# Block markers inside the markdown sources:
+#   <!-- key -->          starts a block
+#   <!-- key: Title -->   starts a titled entry of the `key` group (FAQ questions, conditions)
+#   <!-- column -->       starts the next column of the current block
+BLOCK_MARKER = re.compile(r"^<!--\s*([\w-]+)\s*(?::\s*(.*?))?\s*-->\s*$")
+COLUMN_KEY = "column"
+
+
+class ContentBundle:
+    """Compiled content for one language"""
+
+    def __init__(self, language, version, digest, css, blocks):
+        self.language = language
+        self.version = version
+        self.digest = digest
+        self.css = css
+        self.blocks = blocks
+
+    def text(self, key):
+        """Markdown of a single-column block"""
+        return self.items(key)[0]['columns'][0]
+
+    def columns(self, key):
+        """Markdown of each column of a block"""
+        return self.items(key)[0]['columns']
+
+    def items(self, key):
+        """Every entry of a group, in source order, as dicts with 'title' and 'columns'"""
+        try:
+            return self.blocks[key]
+        except KeyError:
+            raise KeyError(f"No '{key}' block in the {self.language} content bundle") from None
+
+
+def parse_blocks(source, blocks=None):
+    """Split a markdown source into its marked blocks"""
+    blocks = {} if blocks is None else blocks
+    current = None
+    lines = []
+
+    def finish():
+        if current is not None:
+            current['columns'].append("\n".join(lines).strip())
+
+    for line in source.splitlines():
+        match = BLOCK_MARKER.match(line.strip())
+        if not match:
+            lines.append(line)
+            continue
+        finish()
+        lines = []
+        key, title = match.groups()
+        if key == COLUMN_KEY and current is not None:
+            continue
+        current = {'title': title, 'columns': []}
+        blocks.setdefault(key, []).append(current)
+    finish()
+    return blocks
+
+
+def read_manifest(content_dir=CONTENT_DIR):
+    with open(content_dir / "manifest.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def source_files(manifest, language, content_dir=CONTENT_DIR):
+    """The files a language's bundle is compiled from, stylesheet first"""
+    if language not in manifest['languages']:
+        raise KeyError(f"Unknown content language '{language}'")
+    return [content_dir / manifest['stylesheet']] + [content_dir / name for name in manifest['languages'][language]]
+
+
+def compile_bundle(manifest, language, sources):
+    """Build a ContentBundle from the raw (path, text) sources"""
+    digest = hashlib.sha256()
+    digest.update(str(manifest['version']).encode())
+    for path, text in sources:
+        digest.update(path.name.encode())
+        digest.update(text.encode())
+
+    css = f"<style>\n{sources[0][1].strip()}\n</style>"
+    blocks = {}
+    for _, text in sources[1:]:
+        parse_blocks(text, blocks)
+    return ContentBundle(language, manifest['version'], digest.hexdigest()[:12], css, blocks)
+
+
+# Compiled bundles keyed by (language, digest), shared by every session
+_bundles = {}
+# Source files and their modification times per language, so unchanged files are not re-read
+_loaded = {}
+_lock = threading.Lock()
+
+
+def modification_times(paths):
+    return tuple(path.stat().st_mtime_ns for path in paths)
+
+
+def get_content(language, content_dir=CONTENT_DIR):
+    """
+    Content bundle for `language`, compiled once per process.
+    Sources are only re-read when a file changes, and an edit that restores
+    earlier content reuses the bundle already compiled for that digest.
+    """
+    with _lock:
+        loaded = _loaded.get((content_dir, language))
+        if loaded is not None and loaded['mtimes'] == modification_times(loaded['paths']):
+            return _bundles[loaded['key']]
+
+        manifest = read_manifest(content_dir)
+        paths = [content_dir / "manifest.json"] + source_files(manifest, language, content_dir)
+        mtimes = modification_times(paths)
+        sources = [(path, path.read_text(encoding="utf-8")) for path in paths[1:]]
+        bundle = compile_bundle(manifest, language, sources)
+
+        key = (language, bundle.digest)
+        _bundles.setdefault(key, bundle)
+        _loaded[(content_dir, language)] = {'paths': paths, 'mtimes': mtimes, 'key': key}
+        return _bundles[key]
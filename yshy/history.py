@@ -0,0 +1,313 @@
+"""Session history, symptom tracker and trend helpers shared by the pages"""
+import base64
+import hashlib
+import json
+import uuid
+from datetime import datetime
+
+from yshy.metrics import timed
+
+# Symptom text kept with a history entry
+SYMPTOM_TEXT_LIMIT = 100
+
+# Entry types written by older versions of the Hindi page
+LEGACY_ENTRY_TYPES = {"symptom_analysis": "symptom_check"}
+
+
+def init_session(state, language):
+    """Set the per-session defaults both pages rely on"""
+    if 'session_id' not in state:
+        state['session_id'] = str(uuid.uuid4())
+    if 'history' not in state:
+        state['history'] = []
+    if 'history_file' not in state:
+        state['history_file'] = None
+    if 'user_timezone' not in state:
+        state['user_timezone'] = "UTC"
+    if 'language' not in state:
+        state['language'] = language
+    if 'symptom_tracker' not in state:
+        state['symptom_tracker'] = []
+    if 'reminder_days' not in state:
+        state['reminder_days'] = 7
+
+
+def new_entry_id(state):
+    """Generate a unique anonymous ID based on session and timestamp"""
+    unique_string = f"{state['session_id']}-{datetime.now().isoformat()}"
+    return hashlib.sha256(unique_string.encode()).hexdigest()[:12]
+
+
+def normalize_entry(entry):
+    """
+    Bring an entry onto the shared schema. Older Hindi entries stored the
+    response under "result" and the symptoms under "symptoms".
+    """
+    entry = dict(entry)
+    if "result" in entry and "analysis" not in entry:
+        entry["analysis"] = entry.pop("result")
+    if "symptoms" in entry and "symptom_text" not in entry:
+        entry["symptom_text"] = entry.pop("symptoms")
+    entry_type = entry.get("type", "analysis")
+    entry["type"] = LEGACY_ENTRY_TYPES.get(entry_type, entry_type)
+    return entry
+
+
+def find_entry(history, entry_id):
+    """Find a history entry by its anonymous ID"""
+    if not entry_id:
+        return None
+    for entry in reversed(history):
+        if entry.get("id") == entry_id:
+            return entry
+    return None
+
+
+def add_to_symptom_tracker(state, condition, severity, date=None):
+    """Add a symptom entry to the tracker"""
+    if date is None:
+        date = datetime.now()
+
+    state['symptom_tracker'].append({
+        "date": date.isoformat(),
+        "condition": condition,
+        "severity": severity
+    })
+
+
+def record_image_analysis(state, analyses, combined_severity, all_conditions, timestamp=None, image_clusters=None):
+    """
+    Store a multi-image analysis and track its most likely condition. The
+    entry's model tier is the one every image used, or "mixed".
+    `image_clusters` are the near-duplicate groups of uploaded image numbers
+    (only each group's first image was analyzed), or None when the upload
+    was not checked for near-duplicates.
+    """
+    timestamp = timestamp or datetime.now()
+    tiers = {analysis.get("model_tier") for analysis in analyses}
+    entry = {
+        "id": new_entry_id(state),
+        "timestamp": timestamp.isoformat(),
+        "type": "multi_image_analysis",
+        "image_count": len(analyses),
+        "analyses": analyses,
+        "combined_severity": combined_severity,
+        "all_conditions": all_conditions,
+        "model_tier": tiers.pop() if len(tiers) == 1 else "mixed",
+        "tokens": sum_tokens(analysis.get("tokens") for analysis in analyses),
+        "image_clusters": image_clusters
+    }
+    state['history'].append(entry)
+
+    if all_conditions:
+        add_to_symptom_tracker(state, all_conditions[0], combined_severity, timestamp)
+    return entry
+
+
+def record_symptom_check(state, analysis, symptom_text, conditions=None, severity=None, model_tier=None, tokens=None,
+                         timestamp=None):
+    """
+    Store a symptom check. When the user rated the severity, the conditions
+    found in the response are tracked at that severity.
+    """
+    timestamp = timestamp or datetime.now()
+    entry = {
+        "id": new_entry_id(state),
+        "timestamp": timestamp.isoformat(),
+        "type": "symptom_check",
+        "analysis": analysis,
+        "symptom_text": symptom_text[:SYMPTOM_TEXT_LIMIT] + "..." if len(symptom_text) > SYMPTOM_TEXT_LIMIT else symptom_text,
+        "conditions": conditions or [],
+        "model_tier": model_tier,
+        "tokens": tokens
+    }
+    if severity is not None:
+        entry["severity"] = severity
+        for condition in entry["conditions"]:
+            add_to_symptom_tracker(state, condition, severity, timestamp)
+    state['history'].append(entry)
+    return entry
+
+
+def sum_tokens(token_counts):
+    """Prompt and output tokens added up over several {"prompt", "output"} counts (None is skipped)"""
+    total = {"prompt": 0, "output": 0}
+    for tokens in token_counts:
+        for direction in total:
+            total[direction] += (tokens or {}).get(direction) or 0
+    return total
+
+
+def token_usage(history):
+    """Requests and tokens per entry type over a session's history"""
+    usage = {}
+    for entry in history:
+        if not entry.get("tokens"):
+            continue
+        totals = usage.setdefault(entry.get("type", "analysis"), {"entries": 0, "prompt": 0, "output": 0})
+        totals["entries"] += 1
+        for direction in ("prompt", "output"):
+            totals[direction] += entry["tokens"].get(direction) or 0
+    return usage
+
+
+def export_history(state):
+    """Save analysis history to an encoded file for user download"""
+    if state['history']:
+        history_data = json.dumps({
+            "session_id": state['session_id'],
+            "history": state['history'],
+            "symptom_tracker": state['symptom_tracker'],
+            "exported_date": datetime.now().isoformat()
+        })
+        # Simple encryption by encoding to base64 (not truly secure but adds a layer of privacy)
+        encoded_data = base64.b64encode(history_data.encode()).decode()
+        state['history_file'] = encoded_data
+        return encoded_data
+    return None
+
+
+def import_history(state, file_content):
+    """
+    Load analysis history from an exported file, upgrading older entries.
+    Returns False if the file is not a history export; decoding errors propagate.
+    """
+    data = json.loads(base64.b64decode(file_content).decode())
+
+    # Validate the data structure
+    if "history" in data and "session_id" in data and "symptom_tracker" in data:
+        state['history'] = [normalize_entry(entry) for entry in data["history"]]
+        state['symptom_tracker'] = data["symptom_tracker"]
+        return True
+    return False
+
+
+def history_trend_data(history, catalog):
+    """
+    Extract condition trend data from session history
+    Returns a DataFrame with date, severity, and condition columns
+    """
+    trend_records = []
+
+    for entry in history:
+        # Parse timestamp
+        try:
+            if isinstance(entry.get("timestamp"), str):
+                timestamp = datetime.fromisoformat(entry["timestamp"])
+            else:
+                continue
+        except (ValueError, TypeError):
+            continue
+
+        entry_type = entry.get("type", "analysis")
+
+        if entry_type == "multi_image_analysis":
+            # Use combined severity for multi-image analysis
+            severity = entry.get("combined_severity")
+            conditions = entry.get("all_conditions", [])
+        else:
+            severity = entry.get("severity")
+            conditions = entry.get("conditions", [])
+
+        # Skip entries without severity data
+        try:
+            severity = float(severity)
+        except (ValueError, TypeError):
+            continue
+
+        # Add records for each condition or one general record
+        for condition in conditions or [catalog('history.general_concern')]:
+            trend_records.append({
+                'date': timestamp.date(),
+                'datetime': timestamp,
+                'severity': severity,
+                'condition': condition,
+                'type': entry_type
+            })
+
+    if not trend_records:
+        return None
+
+    import pandas as pd
+
+    # Convert to DataFrame and sort by date
+    with timed("trend_dataframe", source="history"):
+        return pd.DataFrame(trend_records).sort_values('datetime')
+
+
+def tracker_trend_data(tracker):
+    """Symptom tracker entries as a DataFrame sorted by date"""
+    if not tracker:
+        return None
+
+    import pandas as pd
+
+    with timed("trend_dataframe", source="tracker"):
+        df = pd.DataFrame(tracker)
+        if df.empty:
+            return None
+
+        # Tracker dates may or may not carry a time component
+        df['date'] = pd.to_datetime(df['date'], format='mixed')
+        return df.sort_values('date')
+
+
+def calculate_trend_stats(trend_data):
+    """Calculate trend statistics from the data"""
+    if trend_data is None or trend_data.empty:
+        return None
+
+    stats = {}
+
+    # Overall statistics
+    stats['total_entries'] = len(trend_data)
+    stats['date_range'] = (trend_data['date'].max() - trend_data['date'].min()).days + 1
+    stats['avg_severity'] = trend_data['severity'].mean()
+    stats['max_severity'] = trend_data['severity'].max()
+    stats['min_severity'] = trend_data['severity'].min()
+
+    # Trend analysis
+    if len(trend_data) >= 2:
+        stats['trend_direction'] = trend_data.iloc[-1]['severity'] - trend_data.iloc[0]['severity']
+
+        # Linear trend (simple slope calculation)
+        x = list(range(len(trend_data)))
+        y = trend_data['severity'].tolist()
+        n = len(x)
+        stats['trend_slope'] = (n * sum(xi * yi for xi, yi in zip(x, y)) - sum(x) * sum(y)) / (n * sum(xi**2 for xi in x) - sum(x)**2)
+    else:
+        stats['trend_direction'] = 0
+        stats['trend_slope'] = 0
+
+    # Condition frequency
+    stats['condition_frequency'] = trend_data['condition'].value_counts().to_dict()
+
+    return stats
+
+
+def format_local_time(timestamp, timezone_name, catalog):
+    """Format a timestamp in the user's timezone"""
+    try:
+        dt = datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp
+
+        import pytz
+        return dt.astimezone(pytz.timezone(timezone_name)).strftime(catalog('history.time_format'))
+    except Exception:
+        return catalog('history.unknown_time')
+
+
+def entry_title(entry, timezone_name, catalog):
+    """Expander title for a history entry"""
+    local_time = format_local_time(entry.get("timestamp", ""), timezone_name, catalog)
+    entry_type = entry.get("type", "analysis")
+
+    if entry_type == "multi_image_analysis":
+        return catalog('history.title.multi_image_analysis', count=entry.get("image_count", 1), time=local_time)
+    if entry_type == "symptom_check":
+        title = catalog('history.title.symptom_check', time=local_time)
+        if len(entry.get("symptom_text", "")) < 50 and entry.get("symptom_text"):
+            title += f" - {entry['symptom_text']}"
+        return title
+    if entry_type == "image_analysis":
+        return catalog('history.title.image_analysis', time=local_time)
+    return catalog('history.title.other', time=local_time)
@@ -0,0 +1,78 @@
+"""Message catalogs: the strings the shared core needs in each language"""
+import json
+import string
+import threading
+
+from yshy.content import CONTENT_DIR
+
+CATALOG_DIR = CONTENT_DIR / "i18n"
+
+# Every other catalog falls back to this one for keys it does not translate
+DEFAULT_LANGUAGE = "en"
+
+
+class CatalogError(Exception):
+    """Raised when a catalog is missing or does not match the default catalog"""
+
+
+class Catalog:
+    """Compiled messages for one language"""
+
+    def __init__(self, language, messages):
+        self.language = language
+        self.messages = messages
+
+    def __call__(self, key, **values):
+        """The message for `key`, with any {placeholders} filled from `values`"""
+        message = self.messages[key]
+        return message.format(**values) if values else message
+
+    def get(self, key):
+        """The raw value for `key` (strings, or lists such as keyword variants)"""
+        return self.messages[key]
+
+
+def placeholders(message):
+    if not isinstance(message, str):
+        return set()
+    return {field for _, field, _, _ in string.Formatter().parse(message) if field}
+
+
+def read_catalog(language, catalog_dir=CATALOG_DIR):
+    path = catalog_dir / f"{language}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise CatalogError(f"No message catalog for '{language}' ({path})") from None
+
+
+def compile_catalog(language, catalog_dir=CATALOG_DIR):
+    """
+    Merge a language's messages over the default catalog and check that every
+    translation uses the same placeholders, so format errors surface at load
+    time instead of in the middle of a request.
+    """
+    messages = read_catalog(DEFAULT_LANGUAGE, catalog_dir)
+    if language != DEFAULT_LANGUAGE:
+        translated = read_catalog(language, catalog_dir)
+        unknown = set(translated) - set(messages)
+        if unknown:
+            raise CatalogError(f"Keys not in the {DEFAULT_LANGUAGE} catalog: {', '.join(sorted(unknown))}")
+        for key, message in translated.items():
+            if placeholders(message) != placeholders(messages[key]):
+                raise CatalogError(f"Placeholders of '{key}' in the {language} catalog do not match {DEFAULT_LANGUAGE}")
+        messages.update(translated)
+    return Catalog(language, messages)
+
+
+_catalogs = {}
+_lock = threading.Lock()
+
+
+def get_catalog(language):
+    """Compiled catalog for `language`, loaded once per process"""
+    with _lock:
+        if language not in _catalogs:
+            _catalogs[language] = compile_catalog(language)
+        return _catalogs[language]
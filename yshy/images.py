@@ -0,0 +1,171 @@
+"""Image helpers for uploaded photos"""
+import functools
+import io
+import os
+from collections import namedtuple
+
+from yshy.metrics import timed
+
+# Uploads larger than this (longest side, in pixels) are downscaled before analysis
+MAX_IMAGE_SIDE = 1536
+JPEG_QUALITY = 90
+
+# Quality gate: images outside these bounds are analyzed with a warning
+MIN_IMAGE_SIDE = 200
+MIN_BRIGHTNESS = 40
+MAX_BRIGHTNESS = 225
+# Variance of the Laplacian of the grayscale image; lower is blurrier
+MIN_SHARPNESS = 10
+
+# An upload ready for the model: bytes and MIME type to send, and quality issues found
+PreparedImage = namedtuple("PreparedImage", ["data", "mime_type", "issues"])
+
+# Images whose dHash and pHash both differ in at most this many of 64 bits are near-duplicates
+DUPLICATE_DISTANCE = int(os.getenv("YSHY_DUPLICATE_DISTANCE", 6))
+
+# 64-bit difference hash and DCT-based perceptual hash of an image
+ImageHash = namedtuple("ImageHash", ["dhash", "phash"])
+
+
+def anonymize_image(image_bytes, watermark):
+    """Apply a subtle watermark to indicate the image is being processed privately"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    with timed("anonymize_image"):
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            draw = ImageDraw.Draw(img)
+
+            # Add subtle "PRIVATE ANALYSIS" text in corner
+            try:
+                font = ImageFont.truetype("arial.ttf", 20)
+            except IOError:
+                font = ImageFont.load_default()
+
+            # Add semi-transparent text in corner
+            draw.text((10, 10), watermark, fill=(255, 255, 255, 128), font=font)
+
+            # Convert back to bytes
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG")
+            return buffer.getvalue()
+        except Exception:
+            # If any error occurs, return original image
+            return image_bytes
+
+
+def quality_issues(img):
+    """Quality gate findings for a decoded image, any of: small, dark, bright, blurry"""
+    from PIL import ImageFilter, ImageStat
+
+    issues = []
+    if min(img.size) < MIN_IMAGE_SIDE:
+        issues.append("small")
+    gray = img.convert("L")
+    gray.thumbnail((512, 512))
+    brightness = ImageStat.Stat(gray).mean[0]
+    if brightness < MIN_BRIGHTNESS:
+        issues.append("dark")
+    elif brightness > MAX_BRIGHTNESS:
+        issues.append("bright")
+    laplacian = gray.filter(ImageFilter.Kernel((3, 3), [0, 1, 0, 1, -4, 1, 0, 1, 0], scale=1, offset=128))
+    if ImageStat.Stat(laplacian).var[0] < MIN_SHARPNESS:
+        issues.append("blurry")
+    return issues
+
+
+def prepare_image(image_bytes, mime_type):
+    """
+    Decode an upload, check its quality and downscale it to MAX_IMAGE_SIDE.
+    Images within the limit are sent as uploaded. Raises ValueError for
+    files that are not readable images, before any model call is made.
+    """
+    from PIL import Image, ImageOps
+
+    with timed("prepare_image"):
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            img.load()
+        except Exception as e:
+            raise ValueError("Could not read the image") from e
+
+        issues = quality_issues(img)
+        if max(img.size) <= MAX_IMAGE_SIDE:
+            return PreparedImage(image_bytes, mime_type, issues)
+
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        img.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+        return PreparedImage(buffer.getvalue(), "image/jpeg", issues)
+
+
+@functools.lru_cache(maxsize=None)
+def _dct_matrix(size):
+    """Orthonormal DCT-II matrix; the 2-D DCT of X is D @ X @ D.T"""
+    import numpy as np
+
+    k = np.arange(size)[:, None]
+    i = np.arange(size)[None, :]
+    matrix = np.sqrt(2 / size) * np.cos(np.pi * (2 * i + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def _pack(bits):
+    value = 0
+    for bit in bits.flatten():
+        value = value << 1 | int(bit)
+    return value
+
+
+def image_hash(image_bytes):
+    """dHash and pHash of an upload, or None if it cannot be decoded"""
+    import numpy as np
+    from PIL import Image, ImageOps
+
+    with timed("image_hash"):
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            # JPEGs decode at a fraction of their size, which is all the hashes need
+            img.draft("L", (128, 128))
+            gray = ImageOps.exif_transpose(img).convert("L")
+        except Exception:
+            return None
+
+        # dHash: is each pixel brighter than its left neighbour, on a 9x8 thumbnail
+        pixels = np.asarray(gray.resize((9, 8), Image.LANCZOS), dtype=np.int16)
+        dhash = _pack(pixels[:, 1:] > pixels[:, :-1])
+
+        # pHash: lowest 8x8 DCT frequencies of a 32x32 thumbnail against their median
+        pixels = np.asarray(gray.resize((32, 32), Image.LANCZOS), dtype=np.float64)
+        dct = _dct_matrix(32)
+        low = (dct @ pixels @ dct.T)[:8, :8]
+        phash = _pack(low > np.median(low.flatten()[1:]))
+        return ImageHash(dhash, phash)
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def near_duplicates(hashes, max_distance=DUPLICATE_DISTANCE):
+    """
+    Group images by their ImageHash (None for unreadable images, which stay
+    alone). Returns clusters of 1-based image numbers in upload order, each
+    led by its first image. An image joins a cluster only when it is within
+    `max_distance` of the cluster's first image by both hashes, so clusters
+    do not chain through intermediate images.
+    """
+    clusters = []
+    for number, image in enumerate(hashes, 1):
+        for cluster in clusters:
+            first = hashes[cluster[0] - 1]
+            if (image is not None and first is not None
+                    and hamming_distance(image.dhash, first.dhash) <= max_distance
+                    and hamming_distance(image.phash, first.phash) <= max_distance):
+                cluster.append(number)
+                break
+        else:
+            clusters.append([number])
+    return clusters
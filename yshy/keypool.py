@@ -0,0 +1,129 @@
+"""
+Pool of Gemini API keys (one per project) so one deployment can use several
+quotas. Each call goes to the key with the most requests left in its
+per-minute budget. A key answered with a 429/503 cools down before it is
+chosen again, and per-key usage is exported as metrics.
+
+    GEMINI_API_KEYS="project-a=AIza...,project-b=AIza...@60"
+
+Entries are `name=key`, optionally followed by `@requests-per-minute`; a bare
+key is named by its position. Without GEMINI_API_KEYS the pool holds the
+single GEMINI_API_KEY.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from yshy.limiter import is_overload_error
+from yshy.metrics import inc, set_gauge
+
+# Requests per minute assumed for keys without an explicit budget
+DEFAULT_REQUESTS_PER_MINUTE = 15
+
+# Cooldown after a key's first consecutive 429; doubled for each further one
+BASE_COOLDOWN_SECONDS = 30
+MAX_COOLDOWN_SECONDS = 10 * 60
+
+BUDGET_WINDOW_SECONDS = 60
+
+
+class ApiKey:
+    """One key with its per-minute budget, cooldown and usage"""
+
+    def __init__(self, name, key, requests_per_minute):
+        self.name = name
+        self.key = key
+        self.requests_per_minute = requests_per_minute
+        # Start times of the requests in the last minute
+        self.recent = deque()
+        self.cooldown_until = 0.0
+        self.consecutive_overloads = 0
+
+    def remaining(self, now):
+        while self.recent and now - self.recent[0] >= BUDGET_WINDOW_SECONDS:
+            self.recent.popleft()
+        return self.requests_per_minute - len(self.recent)
+
+    def __repr__(self):
+        # Never show the key itself
+        return f"ApiKey({self.name!r})"
+
+
+def parse_keys(spec, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    """ApiKeys from a GEMINI_API_KEYS value"""
+    keys = []
+    for number, entry in enumerate((part.strip() for part in spec.split(",")), 1):
+        if not entry:
+            continue
+        name, _, key = entry.rpartition("=")
+        key, _, budget = key.partition("@")
+        keys.append(ApiKey(name.strip() or f"key{number}", key.strip(),
+                           int(budget) if budget else requests_per_minute))
+    return keys
+
+
+class KeyPool:
+    """Chooses a key for each request and tracks how each key is doing"""
+
+    def __init__(self, keys):
+        if not keys:
+            raise ValueError("The API key pool needs at least one key")
+        self.keys = keys
+        self._lock = threading.Lock()
+        for key in keys:
+            self._publish(key, time.monotonic())
+
+    def _publish(self, key, now):
+        set_gauge('yshy_gemini_key_remaining_requests', key.remaining(now), key=key.name)
+        set_gauge('yshy_gemini_key_cooling_down', int(key.cooldown_until > now), key=key.name)
+
+    def acquire(self, exclude=()):
+        """
+        The available key with the most budget left, charged for one request.
+        If every key is cooling down, the one that recovers first. Keys in
+        `exclude` (already tried for this request) are skipped; None when no
+        other key is left.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [key for key in self.keys if key not in exclude]
+            if not candidates:
+                return None
+            available = [key for key in candidates if key.cooldown_until <= now]
+            if available:
+                chosen = max(available, key=lambda key: key.remaining(now))
+            else:
+                chosen = min(candidates, key=lambda key: key.cooldown_until)
+            chosen.recent.append(now)
+            self._publish(chosen, now)
+            return chosen
+
+    def report(self, key, error=None):
+        """Record a request's outcome; 429/503 responses cool the key down"""
+        overloaded = error is not None and is_overload_error(error)
+        with self._lock:
+            now = time.monotonic()
+            if overloaded:
+                cooldown = min(MAX_COOLDOWN_SECONDS, BASE_COOLDOWN_SECONDS * 2 ** key.consecutive_overloads)
+                key.cooldown_until = now + cooldown
+                key.consecutive_overloads += 1
+            elif error is None:
+                key.consecutive_overloads = 0
+            self._publish(key, now)
+        outcome = "ok" if error is None else "overloaded" if overloaded else "error"
+        inc('yshy_gemini_key_requests_total', key=key.name, outcome=outcome)
+
+    def available(self):
+        """Keys not cooling down right now"""
+        now = time.monotonic()
+        return [key for key in self.keys if key.cooldown_until <= now]
+
+
+def pool_from_environment():
+    """Pool from GEMINI_API_KEYS (or GEMINI_API_KEY); YSHY_GEMINI_KEY_RPM is the default per-key budget"""
+    requests_per_minute = int(os.getenv("YSHY_GEMINI_KEY_RPM", DEFAULT_REQUESTS_PER_MINUTE))
+    spec = os.getenv("GEMINI_API_KEYS")
+    if spec:
+        return KeyPool(parse_keys(spec, requests_per_minute))
+    return KeyPool([ApiKey("default", os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"), requests_per_minute)])
@@ -0,0 +1,189 @@
+"""
+Adaptive (AIMD) limit on concurrent upstream calls, shared by every session.
+
+While calls succeed at their usual latency the limit grows by about one slot
+per limit's worth of calls (additive increase). A 429/503 or a call slower than
+LATENCY_SPIKE_FACTOR times the running average halves it (multiplicative
+decrease). Calls that started before a cut cannot cut again, so one burst of
+errors costs one halving rather than one per failed call.
+
+Waiting callers are served by priority class (interactive checks before bulk
+batches), then the session served least recently, then the longest wait, so
+one session's batch cannot starve other sessions' quick checks. A batch call
+that has waited BATCH_PROMOTION_SECONDS competes as interactive.
+"""
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from yshy.metrics import inc, set_gauge, timed
+
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 32
+DEFAULT_INITIAL_LIMIT = 4
+
+# Factor the limit is multiplied by on overload
+BACKOFF = 0.5
+
+# A call this many times slower than the average latency counts as overload
+LATENCY_SPIKE_FACTOR = 2.0
+
+# Weight of the newest call in the running average latency, and the calls
+# needed before latency spikes are judged at all
+LATENCY_SMOOTHING = 0.1
+LATENCY_WARMUP_CALLS = 5
+
+# HTTP statuses meaning the upstream wants less traffic
+OVERLOAD_STATUSES = (429, 503)
+
+# Priority classes, most urgent first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_CLASSES = ("interactive", "batch")
+
+BATCH_PROMOTION_SECONDS = 30
+
+# Sessions whose last grant is remembered for fairness
+MAX_TRACKED_SESSIONS = 1024
+
+
+def is_overload_error(error):
+    """Whether `error` is a rate-limit or unavailable response (google.api_core errors carry .code)"""
+    return getattr(error, "code", None) in OVERLOAD_STATUSES
+
+
+class _Waiter:
+    def __init__(self, priority, session, sequence):
+        self.priority = priority
+        self.session = session
+        self.enqueued = time.monotonic()
+        self.sequence = sequence
+
+    def effective_priority(self, now):
+        if self.priority > INTERACTIVE and now - self.enqueued >= BATCH_PROMOTION_SECONDS:
+            return INTERACTIVE
+        return self.priority
+
+
+class AdaptiveLimiter:
+    """Blocks callers beyond the current limit and adjusts the limit from their outcomes"""
+
+    def __init__(self, name, min_limit=DEFAULT_MIN_LIMIT, max_limit=DEFAULT_MAX_LIMIT, initial_limit=DEFAULT_INITIAL_LIMIT):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        # session -> when it was last granted a slot, least recent first
+        self._last_served = OrderedDict()
+        # Running average latency per kind of call: kind -> (average, calls)
+        self._latency = {}
+        # Bumped on every cut; calls remember the epoch they started in
+        self._epoch = 0
+        self._condition = threading.Condition()
+        self._publish()
+
+    def _publish(self):
+        set_gauge('yshy_upstream_concurrency_limit', int(self.limit), upstream=self.name)
+        set_gauge('yshy_upstream_in_flight', self.in_flight, upstream=self.name)
+        for priority, name in enumerate(PRIORITY_CLASSES):
+            waiting = sum(waiter.priority == priority for waiter in self._waiters)
+            set_gauge('yshy_upstream_queue_depth', waiting, upstream=self.name, priority=name)
+
+    def _next_waiter(self):
+        now = time.monotonic()
+        return min(self._waiters, key=lambda waiter: (
+            waiter.effective_priority(now),
+            self._last_served.get(waiter.session, 0.0),
+            waiter.enqueued,
+            waiter.sequence,
+        ))
+
+    def acquire(self, priority=INTERACTIVE, session=None):
+        """Wait for a free slot and this caller's turn; returns the epoch to pass to release()"""
+        waiter = _Waiter(priority, session, next(self._sequence))
+        with self._condition:
+            self._waiters.append(waiter)
+            self._publish()
+            try:
+                while self.in_flight >= int(self.limit) or self._next_waiter() is not waiter:
+                    self._condition.wait()
+            except BaseException:
+                # A waiter left behind would be chosen next forever and block everyone after it
+                self._waiters.remove(waiter)
+                self._publish()
+                self._condition.notify_all()
+                raise
+            self._waiters.remove(waiter)
+            self.in_flight += 1
+
+            self._last_served[session] = time.monotonic()
+            self._last_served.move_to_end(session)
+            if len(self._last_served) > MAX_TRACKED_SESSIONS:
+                self._last_served.popitem(last=False)
+
+            self._publish()
+            # The next waiter may fit under the limit too
+            self._condition.notify_all()
+            return self._epoch
+
+    def release(self, epoch, kind, latency, error=None):
+        """Free the slot and adapt the limit to how the call went"""
+        with self._condition:
+            self.in_flight -= 1
+            average, calls = self._latency.get(kind, (latency, 0))
+            spiked = calls >= LATENCY_WARMUP_CALLS and latency > LATENCY_SPIKE_FACTOR * average
+
+            if error is not None and is_overload_error(error):
+                self._decrease(epoch, "overload")
+            elif spiked:
+                self._decrease(epoch, "latency")
+            elif error is None and self.in_flight + 1 >= int(self.limit):
+                # Only grow when the limit was actually reached
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            if error is None:
+                self._latency[kind] = (average + LATENCY_SMOOTHING * (latency - average), calls + 1)
+            self._publish()
+            self._condition.notify_all()
+
+    def _decrease(self, epoch, reason):
+        if epoch != self._epoch:
+            return
+        self._epoch += 1
+        self.limit = max(self.min_limit, self.limit * BACKOFF)
+        inc('yshy_upstream_limit_decreases_total', upstream=self.name, reason=reason)
+
+    @contextmanager
+    def slot(self, kind, priority=INTERACTIVE, session=None):
+        """Hold a slot for the duration of the block; the wait for it is timed as upstream_queue"""
+        with timed("upstream_queue", upstream=self.name, kind=kind, priority=PRIORITY_CLASSES[priority]):
+            epoch = self.acquire(priority, session)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.release(epoch, kind, time.perf_counter() - started, error)
+
+
+def limiter_from_environment(name):
+    """
+    Limiter for the `name` upstream configured by YSHY_<NAME>_MIN_CONCURRENCY,
+    YSHY_<NAME>_MAX_CONCURRENCY and YSHY_<NAME>_INITIAL_CONCURRENCY.
+    """
+    prefix = f"YSHY_{name.upper()}"
+    return AdaptiveLimiter(
+        name,
+        min_limit=int(os.getenv(f"{prefix}_MIN_CONCURRENCY", DEFAULT_MIN_LIMIT)),
+        max_limit=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", DEFAULT_MAX_LIMIT)),
+        initial_limit=int(os.getenv(f"{prefix}_INITIAL_CONCURRENCY", DEFAULT_INITIAL_LIMIT)),
+    )
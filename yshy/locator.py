@@ -0,0 +1,283 @@
+"""Healthcare provider locator: normalization and ranking of Overpass results"""
+import time
+
+import numpy as np
+
+from yshy.metrics import inc, timed
+from yshy.overpass import iter_elements
+
+EARTH_RADIUS_KM = 6371
+
+# Providers mapped more than once (node + way, duplicate strategies) collapse
+# onto the same cell of this grid (~11 m), matching the old 4-decimal keys
+DEDUPE_GRID_DEGREES = 1e-4
+
+INVALID_NAMES = {'yes', 'no', '', 'null'}
+
+# Strategies stop once this many candidates have been found
+ENOUGH_CANDIDATES = 10
+
+# Longest a single Overpass request may wait for data
+STRATEGY_TIMEOUT = 20
+
+# Regions searched without appending ", India" to the geocoding query
+NON_INDIA_REGIONS = ["United States", "United Kingdom", "Canada", "Australia", "Other"]
+
+# The only OSM tags the locator reads; everything else is dropped while parsing
+USED_TAGS = {
+    'name', 'operator', 'brand', 'amenity', 'healthcare', 'office',
+    'addr:housenumber', 'addr:street', 'addr:city',
+    'phone', 'contact:phone', 'website', 'contact:website', 'opening_hours',
+}
+
+
+def element_coordinates(element):
+    """Return (lat, lon) for an Overpass node or way, or None if it has no position"""
+    try:
+        if element['type'] == 'node':
+            return float(element['lat']), float(element['lon'])
+        if element['type'] == 'way' and 'center' in element:
+            return float(element['center']['lat']), float(element['center']['lon'])
+    except (KeyError, TypeError, ValueError):
+        pass
+    return None
+
+
+def provider_name(tags):
+    """Get the display name of a provider (with multiple fallbacks)"""
+    return (tags.get('name') or
+            tags.get('operator') or
+            tags.get('brand') or
+            'Healthcare Provider')
+
+
+def is_valid_name(name):
+    """Skip obviously bad names"""
+    return name.lower() not in INVALID_NAMES and len(name) >= 2
+
+
+def classify_provider(tags):
+    """Determine the provider type from OSM tags"""
+    amenity = tags.get('amenity', '')
+    healthcare = tags.get('healthcare', '')
+    office = tags.get('office', '')
+
+    if amenity == 'hospital' or healthcare == 'hospital':
+        return 'Hospital'
+    elif amenity == 'pharmacy':
+        return 'Pharmacy'
+    elif amenity == 'clinic' or healthcare == 'clinic':
+        return 'Clinic'
+    elif amenity == 'doctors' or healthcare == 'doctor' or office in ['healthcare', 'physician']:
+        return 'Doctor/Physician'
+    return 'Healthcare Facility'
+
+
+def build_provider(tags, provider_lat, provider_lon, distance, city, state):
+    """Build the provider record shown in the UI and the resource list"""
+    address_parts = [tags[key] for key in ['addr:housenumber', 'addr:street', 'addr:city'] if tags.get(key)]
+    address = ', '.join(address_parts) if address_parts else f"Near {city}, {state}"
+
+    return {
+        'name': provider_name(tags),
+        'address': address,
+        'phone': tags.get('phone', tags.get('contact:phone', 'Not available')),
+        'website': tags.get('website', tags.get('contact:website', 'Not available')),
+        'distance': round(float(distance), 2),
+        'lat': provider_lat,
+        'lon': provider_lon,
+        'type': classify_provider(tags),
+        'opening_hours': tags.get('opening_hours', 'Call to confirm hours')
+    }
+
+
+def normalize_element(element):
+    """
+    Reduce a raw Overpass element to a (lat, lon, tags) candidate, keeping only
+    the tags the locator uses. Returns None for elements that can't be shown.
+    """
+    position = element_coordinates(element)
+    if position is None:
+        return None
+    tags = element.get('tags') or {}
+    if not is_valid_name(provider_name(tags)):
+        return None
+    return position[0], position[1], {key: value for key, value in tags.items() if key in USED_TAGS}
+
+
+def iter_candidates(elements):
+    """Normalize elements as they are parsed, skipping unusable ones"""
+    for element in elements:
+        candidate = normalize_element(element)
+        if candidate is not None:
+            yield candidate
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Distance in km from one point to arrays of points using the Haversine formula"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def grid_keys(lats, lons, grid=DEDUPE_GRID_DEGREES):
+    """Snap coordinates to a grid and return one integer key per cell"""
+    lat_idx = np.round(lats / grid).astype(np.int64)
+    lon_idx = np.round(lons / grid).astype(np.int64)
+    lon_span = int(round(360 / grid)) + 1
+    return lat_idx * lon_span + lon_idx
+
+
+@timed("rank_providers")
+def rank_providers(candidates, lat, lon, radius_km, city, state, limit=None):
+    """
+    Filter, deduplicate and rank normalized candidates by distance.
+    Returns (providers, total): the nearest `limit` providers sorted by distance
+    and the number of unique providers found within the radius.
+    """
+    if not candidates:
+        return [], 0
+
+    coords = np.array([(candidate[0], candidate[1]) for candidate in candidates], dtype=np.float64)
+    lats, lons = coords[:, 0], coords[:, 1]
+
+    # Keep the first element seen in each grid cell
+    _, first_seen = np.unique(grid_keys(lats, lons), return_index=True)
+    first_seen.sort()
+
+    distances = haversine_km(lat, lon, lats[first_seen], lons[first_seen])
+    in_radius = first_seen[distances <= radius_km]
+    distances = distances[distances <= radius_km]
+    total = len(in_radius)
+
+    if limit is not None and limit < total:
+        nearest = np.argpartition(distances, limit - 1)[:limit]
+    else:
+        nearest = np.arange(total)
+    nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+
+    providers = []
+    for i in nearest:
+        index = in_radius[i]
+        providers.append(build_provider(candidates[index][2], float(lats[index]), float(lons[index]),
+                                        distances[i], city, state))
+    return providers, total
+
+
+def provider_queries(lat, lon, radius_km):
+    """Overpass queries tried in turn, broadest first"""
+    around = f"(around:{radius_km*1000},{lat},{lon})"
+    return [
+        # Most basic - all doctors and hospitals
+        f"""
+        [out:json][timeout:25];
+        (
+        node["amenity"~"^(doctors|hospital|clinic|pharmacy)$"]{around};
+        way["amenity"~"^(doctors|hospital|clinic|pharmacy)$"]{around};
+        );
+        out center;
+        """,
+
+        # Healthcare tag
+        f"""
+        [out:json][timeout:25];
+        (
+        node["healthcare"]{around};
+        way["healthcare"]{around};
+        );
+        out center;
+        """,
+
+        # Medical offices
+        f"""
+        [out:json][timeout:25];
+        (
+        node["office"="healthcare"]{around};
+        node["office"="physician"]{around};
+        way["office"="healthcare"]{around};
+        );
+        out center;
+        """
+    ]
+
+
+def search_providers(client, lat, lon, radius_km, deadline=None, batch_size=200):
+    """
+    Run the search strategies in turn and yield (event, strategy, payload) as
+    results stream in:
+    - ("batch", strategy, candidates) for every `batch_size` normalized candidates
+    - ("done", strategy, found) when a strategy finishes
+    - ("error", strategy, message) when a strategy fails
+    - ("deadline", strategy, found) when the time budget (a time.monotonic()
+      deadline) runs out; nothing is yielded after it
+    """
+    total = 0
+    for strategy, query in enumerate(provider_queries(lat, lon, radius_km), 1):
+        remaining = STRATEGY_TIMEOUT if deadline is None else deadline - time.monotonic()
+        if remaining <= 0:
+            yield "deadline", strategy, 0
+            return
+
+        found = 0
+        batch = []
+        try:
+            with timed("overpass_request", strategy=strategy):
+                response = client.query(query, timeout=min(STRATEGY_TIMEOUT, max(1, remaining)), stream=True)
+            elements = iter_elements(response)
+            try:
+                for candidate in iter_candidates(elements):
+                    batch.append(candidate)
+                    found += 1
+                    if len(batch) >= batch_size:
+                        yield "batch", strategy, batch
+                        batch = []
+                    if deadline is not None and time.monotonic() >= deadline:
+                        if batch:
+                            yield "batch", strategy, batch
+                        yield "deadline", strategy, found
+                        return
+            finally:
+                elements.close()
+                response.close()
+                inc('yshy_overpass_candidates_total', found, strategy=strategy)
+        except Exception as e:
+            if batch:
+                yield "batch", strategy, batch
+            yield "error", strategy, str(e)
+            total += found
+            continue
+
+        if batch:
+            yield "batch", strategy, batch
+        yield "done", strategy, found
+        total += found
+        if total >= ENOUGH_CANDIDATES:  # Stop if we have enough
+            return
+
+
+def geocode_location(city, state=None):
+    """
+    Look up a city/district (or PIN code) with Nominatim.
+    Returns the geopy Location, or None when nothing matches.
+    """
+    from geopy.geocoders import Nominatim
+
+    query = f"{city}, {state}" if state else city
+    if state not in NON_INDIA_REGIONS:
+        query += ", India"
+    with timed("geocode"):
+        return Nominatim(user_agent="yshy_healthcare_finder").geocode(query)
+
+
+def find_providers(client, lat, lon, radius_km, city, state, deadline=None, limit=None):
+    """
+    Run a whole search and rank the results, for callers that don't show
+    partial results. Returns (providers, total, candidates).
+    """
+    candidates = []
+    for event, _, payload in search_providers(client, lat, lon, radius_km, deadline=deadline):
+        if event == "batch":
+            candidates.extend(payload)
+    providers, total = rank_providers(candidates, lat, lon, radius_km, city, state, limit=limit)
+    return providers, total, candidates
@@ -0,0 +1,278 @@
+"""
+Process-wide latency histograms and counters for external calls and heavy
+stages, exported in Prometheus text format to a local endpoint and/or a file.
+"""
+import atexit
+import bisect
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Bucket bounds for histograms that do not measure seconds
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+METRIC_BUCKETS = {
+    'yshy_gemini_tokens': TOKEN_BUCKETS,
+}
+
+# How often the metrics file is rewritten, in seconds
+DEFAULT_EXPORT_INTERVAL = 15
+
+HELP = {
+    'yshy_stage_duration_seconds': "Time spent in each instrumented stage",
+    'yshy_stage_calls_total': "Completed stage calls by outcome",
+    'yshy_overpass_candidates_total': "Provider candidates parsed from Overpass responses",
+    'yshy_overpass_endpoint_seconds': "Latency of each Overpass endpoint's responses",
+    'yshy_overpass_endpoint_requests_total': "Requests per Overpass endpoint by outcome (ok, failover)",
+    'yshy_overpass_endpoint_healthy': "1 while an Overpass endpoint is not cooling down",
+    'yshy_coalesced_requests_total': "Requests answered by an identical call already in flight",
+    'yshy_symptom_cache_total': "Symptom check cache lookups by result (exact, similar or miss)",
+    'yshy_upstream_concurrency_limit': "Current adaptive limit on concurrent calls to an upstream",
+    'yshy_upstream_in_flight': "Calls to an upstream currently running",
+    'yshy_upstream_queue_depth': "Calls waiting for a concurrency slot by priority class",
+    'yshy_upstream_limit_decreases_total': "Cuts of an upstream's concurrency limit by reason",
+    'yshy_gemini_key_requests_total': "Gemini requests per API key by outcome",
+    'yshy_gemini_key_remaining_requests': "Requests left in an API key's per-minute budget",
+    'yshy_gemini_key_cooling_down': "1 while an API key is cooling down after a 429/503",
+    'yshy_gemini_tokens': "Tokens per Gemini request by direction (prompt, output, prompt_estimate)",
+    'yshy_gemini_truncated_total': "Gemini responses cut off by their output cap",
+    'yshy_model_tier_degraded_total': "Times a model tier was skipped for being slow or failing, by reason",
+    'yshy_speculative_jobs_total': "Speculative upload jobs by result (used, discarded, expired, failed)",
+}
+
+# Labels added to every observation made inside a metric_labels() block
+_context_labels = contextvars.ContextVar("yshy_metric_labels", default=())
+
+# Stage timings of the current script run, collected only while profiling
+_run_timings = contextvars.ContextVar("yshy_run_timings", default=None)
+
+
+class Registry:
+    """Counters, gauges and histograms keyed by metric name and label set"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, metric_buckets=METRIC_BUCKETS):
+        self.buckets = buckets
+        self.metric_buckets = metric_buckets
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, labels=()):
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, labels=()):
+        with self._lock:
+            self.gauges[(name, labels)] = value
+
+    def observe(self, name, value, labels=()):
+        key = (name, labels)
+        with self._lock:
+            buckets = self.metric_buckets.get(name, self.buckets)
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                histogram = self.histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            histogram[0][bisect.bisect_left(buckets, value)] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in self.histograms.items())
+
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            describe(name, "counter")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+
+        for (name, labels), value in gauges:
+            describe(name, "gauge")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+
+        for (name, labels), (bucket_counts, total, count) in histograms:
+            describe(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(self.metric_buckets.get(name, self.buckets) + ("+Inf",), bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {total}")
+            lines.append(f"{name}_count{format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label_value(value)}"' for key, value in labels) + "}"
+
+
+registry = Registry()
+
+
+def current_labels(**labels):
+    """Context labels merged with `labels`, as a sorted tuple usable as a dict key"""
+    merged = dict(_context_labels.get())
+    merged.update(labels)
+    return tuple(sorted((key, str(value)) for key, value in merged.items()))
+
+
+@contextlib.contextmanager
+def metric_labels(**labels):
+    """
+    Tag every metric recorded inside the block (or decorated function) with
+    `labels`, e.g. the page language and tab.
+    """
+    token = _context_labels.set(current_labels(**labels))
+    try:
+        yield
+    finally:
+        _context_labels.reset(token)
+
+
+def collect_run_timings(timings):
+    """
+    Append (stage, labels, seconds) to `timings` for every stage timed from now
+    on in this thread; None stops collecting.
+    """
+    _run_timings.set(timings)
+
+
+def inc(name, value=1, **labels):
+    registry.inc(name, value, current_labels(**labels))
+
+
+def set_gauge(name, value, **labels):
+    """Set a process-wide gauge; unlike counters it is not tagged with the context labels"""
+    registry.set(name, value, tuple(sorted((key, str(label)) for key, label in labels.items())))
+
+
+def observe(name, value, **labels):
+    registry.observe(name, value, current_labels(**labels))
+
+
+@contextlib.contextmanager
+def timed(stage, **labels):
+    """Record how long the block took and whether it raised"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - started
+        observe('yshy_stage_duration_seconds', elapsed, stage=stage, **labels)
+        inc('yshy_stage_calls_total', stage=stage, outcome=outcome, **labels)
+
+        timings = _run_timings.get()
+        if timings is not None:
+            timings.append((stage, current_labels(**labels), elapsed))
+
+
+# Export
+
+def write_metrics(path):
+    """Write the current metrics to `path`, replacing it atomically"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(temp_path, path)
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    """Serve the metrics at http://host:port/metrics from a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="yshy-metrics-server", daemon=True).start()
+    return server
+
+
+def export_to_file(path, interval):
+    """Rewrite the metrics file every `interval` seconds and once more at exit"""
+    def run():
+        while True:
+            time.sleep(interval)
+            write_metrics(path)
+
+    threading.Thread(target=run, name="yshy-metrics-file", daemon=True).start()
+    atexit.register(write_metrics, path)
+
+
+_logger = logging.getLogger(__name__)
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """
+    Start the exporters configured in the environment, once per process:
+    YSHY_METRICS_PORT serves /metrics on localhost, YSHY_METRICS_FILE is
+    rewritten every YSHY_METRICS_INTERVAL seconds. An exporter that cannot
+    start (a busy port, a malformed setting) is logged once and skipped, so
+    the pages keep running without it.
+    """
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+        port = os.getenv("YSHY_METRICS_PORT")
+        if port:
+            try:
+                serve_metrics(int(port))
+            except (OSError, ValueError) as e:
+                _logger.warning("Not serving metrics on YSHY_METRICS_PORT=%s: %s", port, e)
+
+        path = os.getenv("YSHY_METRICS_FILE")
+        if path:
+            try:
+                export_to_file(path, float(os.getenv("YSHY_METRICS_INTERVAL", DEFAULT_EXPORT_INTERVAL)))
+            except ValueError as e:
+                _logger.warning("Not writing metrics to YSHY_METRICS_FILE=%s: %s", path, e)
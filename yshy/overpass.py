@@ -0,0 +1,202 @@
+"""Overpass API client with pooled keep-alive connections and mirror failover"""
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from yshy.metrics import inc, observe, set_gauge
+
+try:
+    import ijson
+except ImportError:  # Fall back to loading the whole payload
+    ijson = None
+
+DEFAULT_MIRRORS = [
+    "https://overpass-api.de/api/interpreter",
+    "https://overpass.kumi.systems/api/interpreter",
+    "https://overpass.private.coffee/api/interpreter",
+]
+
+# Statuses that mean "this mirror is busy or down", so the next one is tried
+FAILOVER_STATUS_CODES = {429, 502, 503, 504}
+
+# Weight of the newest sample in the per-endpoint latency average
+LATENCY_SMOOTHING = 0.3
+
+
+class OverpassError(Exception):
+    """Raised when no Overpass endpoint could answer a query"""
+
+
+def configured_mirrors():
+    """
+    Overpass endpoints in preference order.
+    OVERPASS_LOCAL_URL (a self-hosted instance) is tried first, followed by
+    OVERPASS_MIRRORS (comma-separated) or the public mirrors.
+    """
+    mirrors = []
+    local_url = os.getenv("OVERPASS_LOCAL_URL", "").strip()
+    if local_url:
+        mirrors.append(local_url)
+
+    configured = os.getenv("OVERPASS_MIRRORS", "")
+    public = [url.strip() for url in configured.split(",") if url.strip()] or DEFAULT_MIRRORS
+    mirrors.extend(url for url in public if url not in mirrors)
+    return mirrors
+
+
+class EndpointStats:
+    """Health and latency bookkeeping for one Overpass endpoint"""
+
+    def __init__(self, url, rank):
+        self.url = url
+        self.rank = rank
+        self.requests = 0
+        self.failures = 0
+        self.latency_ewma = None
+        self.last_latency = None
+        self.last_status = None
+        self.cooldown_until = 0.0
+
+    def is_healthy(self, now):
+        return now >= self.cooldown_until
+
+    def record_success(self, latency, status):
+        self.requests += 1
+        self._publish(latency, "ok")
+        self.last_latency = latency
+        self.last_status = status
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self.latency_ewma
+
+    def record_failure(self, latency, status, cooldown):
+        self.requests += 1
+        self.failures += 1
+        self._publish(latency, "failover")
+        self.last_latency = latency
+        self.last_status = status
+        self.cooldown_until = time.monotonic() + cooldown
+
+    def _publish(self, latency, outcome):
+        observe('yshy_overpass_endpoint_seconds', latency, endpoint=self.url)
+        inc('yshy_overpass_endpoint_requests_total', endpoint=self.url, outcome=outcome)
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency_ewma": self.latency_ewma,
+            "last_latency": self.last_latency,
+            "last_status": self.last_status,
+            "healthy": self.is_healthy(time.monotonic()),
+        }
+
+
+class OverpassClient:
+    """Sends Overpass queries over a shared session, failing over between mirrors"""
+
+    def __init__(self, mirrors=None, pool_size=10, cooldown=60):
+        self.cooldown = cooldown
+        self.endpoints = [EndpointStats(url, rank) for rank, url in enumerate(mirrors or configured_mirrors())]
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.endpoints), pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": "yshy_healthcare_finder"})
+
+    def ordered_endpoints(self):
+        """
+        Healthy endpoints in configured order, except that the ones already
+        tried are reordered among themselves fastest first; untried ones keep
+        their configured place, so a fast local instance is never demoted
+        below mirrors it has not been compared with. Cooling-down endpoints
+        are kept as a last resort.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.is_healthy(now)]
+            fastest = iter(sorted((e for e in healthy if e.latency_ewma is not None), key=lambda e: e.latency_ewma))
+            ordered = [next(fastest) if e.latency_ewma is not None else e for e in healthy]
+            cooling = sorted((e for e in self.endpoints if not e.is_healthy(now)), key=lambda e: e.cooldown_until)
+            for endpoint in self.endpoints:
+                set_gauge('yshy_overpass_endpoint_healthy', int(endpoint.is_healthy(now)), endpoint=endpoint.url)
+        return ordered + cooling
+
+    def query(self, query, timeout=20, stream=False):
+        """POST a query to the best available endpoint and return the successful response"""
+        errors = []
+        for endpoint in self.ordered_endpoints():
+            started = time.perf_counter()
+            try:
+                response = self.session.post(endpoint.url, data={"data": query}, timeout=timeout, stream=stream)
+            except requests.RequestException as e:
+                with self._lock:
+                    endpoint.record_failure(time.perf_counter() - started, None, self.cooldown)
+                errors.append(f"{endpoint.url}: {e}")
+                continue
+
+            latency = time.perf_counter() - started
+            if response.status_code == 200:
+                with self._lock:
+                    endpoint.record_success(latency, response.status_code)
+                return response
+
+            if response.status_code in FAILOVER_STATUS_CODES:
+                cooldown = self.cooldown
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    cooldown = max(cooldown, int(retry_after))
+                with self._lock:
+                    endpoint.record_failure(latency, response.status_code, cooldown)
+                errors.append(f"{endpoint.url}: status {response.status_code}")
+                response.close()
+                continue
+
+            # Any other status is a problem with the query itself, not the mirror
+            with self._lock:
+                endpoint.record_success(latency, response.status_code)
+            response.close()
+            raise OverpassError(f"Status {response.status_code} from {endpoint.url}")
+
+        raise OverpassError("All Overpass endpoints failed (" + "; ".join(errors) + ")")
+
+    def endpoint_stats(self):
+        """Per-endpoint request counts, failures and latency"""
+        with self._lock:
+            return [endpoint.as_dict() for endpoint in self.endpoints]
+
+
+def iter_elements(response):
+    """
+    Yield the `elements` of an Overpass JSON response one at a time.
+    With ijson the body is parsed incrementally from the socket, so a large
+    payload is never held in memory at once.
+    """
+    try:
+        if ijson is None:
+            yield from response.json().get("elements", [])
+            return
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, "elements.item", use_float=True)
+    finally:
+        response.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_overpass_client():
+    """Process-wide Overpass client shared by every session"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OverpassClient()
+        return _client
@@ -0,0 +1,186 @@
+"""
+Opt-in per-run profiler. With YSHY_PROFILE=1 or ?profile=1 in the URL, each
+full script run is profiled with cProfile and a sidebar panel shows the hot
+functions, the timed stages of that run and the session's Gemini token usage.
+Disabled, it does nothing beyond checking those two switches.
+"""
+import os
+import threading
+import time
+
+import streamlit as st
+
+from yshy.history import token_usage
+from yshy.metrics import collect_run_timings
+
+# Rows in the hot-function table
+DEFAULT_TOP_N = 25
+
+# Folded stacks deeper than this are cut off
+MAX_STACK_DEPTH = 64
+
+# Call paths with less time than this are dropped from the folded stacks;
+# walking every path of the call graph is otherwise exponential
+MIN_FOLDED_SECONDS = 1e-4
+
+# Profiler enabled in each script thread; st.rerun()/st.stop() skip finish_profile()
+_active = {}
+
+
+class RunProfile:
+    """cProfile and stage timings for one script run"""
+
+    def __init__(self, page, profiler):
+        self.page = page
+        self.profiler = profiler
+        self.timings = []
+        self.started = time.perf_counter()
+
+
+def profiling_requested():
+    if os.getenv("YSHY_PROFILE", "").lower() in ("1", "true", "yes"):
+        return True
+    return st.query_params.get("profile") == "1"
+
+
+def start_profile(page):
+    """
+    Start profiling this run if requested. Returns the RunProfile to pass to
+    finish_profile(), or None when profiling is off.
+    """
+    if _active:
+        stop_interrupted_profile()
+
+    if not profiling_requested():
+        collect_run_timings(None)
+        return None
+
+    import cProfile
+
+    run_profile = RunProfile(page, cProfile.Profile())
+    try:
+        run_profile.profiler.enable()
+        _active[threading.get_ident()] = run_profile.profiler
+    except ValueError:
+        # Python 3.12+ allows one active cProfile per process; another session holds it
+        run_profile.profiler = None
+    collect_run_timings(run_profile.timings)
+    return run_profile
+
+
+def stop_interrupted_profile():
+    """Disable a profiler left running in this thread by a run that never finished"""
+    profiler = _active.pop(threading.get_ident(), None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def function_label(func):
+    filename, lineno, name = func
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ",")
+
+
+def hot_functions(stats, top_n):
+    """The `top_n` functions with the most own time, as table rows"""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top_n]
+    return [
+        {
+            "function": function_label(func),
+            "calls": calls,
+            "own ms": round(own * 1000, 2),
+            "cumulative ms": round(cumulative * 1000, 2),
+        }
+        for func, (_, calls, own, cumulative, _) in rows
+    ]
+
+
+def folded_stacks(stats):
+    """
+    Convert cProfile data into the folded-stack format read by flamegraph.pl,
+    speedscope and inferno ("root;caller;callee <microseconds>" per line).
+    cProfile only keeps caller/callee pairs, so each function's time is split
+    between its callers in proportion to the time each caller spent in it.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, cumulative))
+
+    folded = {}
+
+    def walk(func, stack, budget):
+        _, _, own, cumulative, _ = stats.stats[func]
+        if budget < MIN_FOLDED_SECONDS or cumulative <= 0 or len(stack) >= MAX_STACK_DEPTH:
+            return
+        scale = min(1.0, budget / cumulative)
+        stack = stack + [function_label(func)]
+        key = ";".join(stack)
+        folded[key] = folded.get(key, 0) + own * scale
+        for callee, callee_time in callees.get(func, []):
+            if function_label(callee) not in stack:
+                walk(callee, stack, callee_time * scale)
+
+    for func, (_, _, _, cumulative, callers) in stats.stats.items():
+        if not callers:
+            walk(func, [], cumulative)
+
+    return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in folded.items() if seconds >= 1e-6)
+
+
+def dump_profile(run_profile, stats, directory):
+    """Write the run's pstats file and folded stacks to `directory`"""
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"yshy-{run_profile.page}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    stats.dump_stats(f"{base}.prof")
+    with open(f"{base}.folded", "w", encoding="utf-8") as f:
+        f.write(folded_stacks(stats))
+    return base
+
+
+def finish_profile(run_profile):
+    """Stop profiling and show the panel in the sidebar; YSHY_PROFILE_DIR also dumps the profile"""
+    if run_profile is None:
+        return
+
+    elapsed = time.perf_counter() - run_profile.started
+    if run_profile.profiler is not None:
+        run_profile.profiler.disable()
+        _active.pop(threading.get_ident(), None)
+    collect_run_timings(None)
+
+    with st.sidebar.expander("⏱️ Profiler", expanded=True):
+        st.caption(f"Script run: {elapsed * 1000:.1f} ms")
+
+        if run_profile.timings:
+            st.markdown("**Timed stages**")
+            st.dataframe([
+                {
+                    "stage": stage,
+                    "labels": ", ".join(f"{key}={value}" for key, value in labels if key != "language"),
+                    "ms": round(seconds * 1000, 2),
+                }
+                for stage, labels, seconds in run_profile.timings
+            ], hide_index=True)
+
+        usage = token_usage(st.session_state.get('history', []))
+        if usage:
+            st.markdown("**Gemini tokens this session**")
+            st.dataframe([{"entry type": entry_type, **totals} for entry_type, totals in usage.items()], hide_index=True)
+
+        if run_profile.profiler is None:
+            st.caption("cProfile is busy profiling another session; only stage timings are shown.")
+            return
+
+        import pstats
+        stats = pstats.Stats(run_profile.profiler)
+
+        top_n = int(os.getenv("YSHY_PROFILE_TOP", DEFAULT_TOP_N))
+        st.markdown(f"**Top {top_n} functions by own time**")
+        st.dataframe(hot_functions(stats, top_n), hide_index=True)
+
+        directory = os.getenv("YSHY_PROFILE_DIR")
+        if directory:
+            base = dump_profile(run_profile, stats, directory)
+            st.caption(f"Saved {base}.prof and {base}.folded")
@@ -0,0 +1,130 @@
+"""
+Live progress of a multi-image analysis: a progress bar with an ETA, and one
+line per image showing its stage (queued, uploading, generating, parsing)
+until the image's result takes its place.
+
+Stages are reported from the worker threads analyzing the images, which must
+not touch Streamlit; they are only recorded there, and drawn by refresh() in
+the script thread.
+
+The ETA comes from the median time of recently analyzed images, shared by
+every session, so the first batch after a slow spell is estimated from it.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+from yshy.i18n import get_catalog
+from yshy.tiers import percentile
+
+STAGE_ICONS = {
+    "queued": "⏳",
+    "uploading": "📤",
+    "generating": "🧠",
+    "parsing": "📝",
+}
+
+# Recent per-image times the ETA is estimated from
+LATENCY_WINDOW = 50
+
+# Per-image time assumed before any image has been analyzed
+DEFAULT_IMAGE_SECONDS = 20.0
+
+_image_seconds = deque(maxlen=LATENCY_WINDOW)
+_image_seconds_lock = threading.Lock()
+
+
+def record_image_seconds(seconds):
+    with _image_seconds_lock:
+        _image_seconds.append(seconds)
+
+
+def expected_image_seconds():
+    """Median time of the recently analyzed images"""
+    with _image_seconds_lock:
+        if not _image_seconds:
+            return DEFAULT_IMAGE_SECONDS
+        return percentile(_image_seconds, 0.5)
+
+
+def format_duration(seconds, catalog):
+    if seconds < 60:
+        return catalog('progress.seconds', count=max(1, math.ceil(seconds)))
+    return catalog('progress.minutes', count=math.ceil(seconds / 60))
+
+
+class BatchProgress:
+    """
+    Progress bar and per-image lines for one batch, drawn where it is created.
+    start() and stage() may be called from any thread; the other methods only
+    from the script thread.
+    """
+
+    def __init__(self, files, language, render_result):
+        self.catalog = get_catalog(language)
+        self.names = [file.name for file in files]
+        # Draws one image's analysis; called inside that image's slot
+        self.render_result = render_result
+        self.finished = set()
+        # (image number, start time) of the image being analyzed
+        self.current = None
+        # Latest reported stage of each unfinished image, and the stage drawn for it
+        self.stages = {number: "queued" for number in range(1, len(files) + 1)}
+        self.drawn = {}
+        self.bar = st.progress(0.0)
+        self.slots = [st.empty() for _ in files]
+        self.refresh()
+
+    def start(self, number):
+        self.current = (number, time.monotonic())
+
+    def stage(self, number, stage):
+        self.stages[number] = stage
+
+    def refresh(self):
+        """Draw the stages reported since the last refresh and update the ETA"""
+        for number, stage in list(self.stages.items()):
+            if number in self.finished or self.drawn.get(number) == stage:
+                continue
+            label = self.catalog('progress.image', number=number, name=self.names[number - 1])
+            self.slots[number - 1].caption(f"{STAGE_ICONS[stage]} {label}: {self.catalog(f'progress.{stage}')}")
+            self.drawn[number] = stage
+        self._update()
+
+    def done(self, number, analysis):
+        """Show an image's result; only images whose model call was started with start() are timed"""
+        if self.current is not None and self.current[0] == number:
+            record_image_seconds(time.monotonic() - self.current[1])
+            self.current = None
+        self.finished.add(number)
+        with self.slots[number - 1].container():
+            self.render_result(analysis)
+        self._update()
+
+    def skipped(self, number, original):
+        """Mark a near-duplicate of image `original` as not analyzed on its own"""
+        self.finished.add(number)
+        self.slots[number - 1].caption(
+            f"⏭️ {self.catalog('progress.duplicate', number=number, name=self.names[number - 1], original=original)}")
+        self._update()
+
+    def failed(self, number, message):
+        self.current = None
+        self.finished.add(number)
+        self.slots[number - 1].error(f"❌ {message}")
+        self._update()
+
+    def _update(self):
+        count = len(self.names)
+        text = self.catalog('progress.summary', done=len(self.finished), count=count)
+        remaining = count - len(self.finished)
+        if remaining:
+            expected = expected_image_seconds()
+            eta = remaining * expected
+            if self.current is not None:
+                eta -= min(time.monotonic() - self.current[1], expected)
+            text += " · " + self.catalog('progress.eta', time=format_duration(eta, self.catalog))
+        self.bar.progress(len(self.finished) / count, text=text)
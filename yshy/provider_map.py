@@ -0,0 +1,163 @@
+"""Provider map: server-side clustering and viewport-based marker loading"""
+import html
+import math
+
+import numpy as np
+
+from yshy.locator import grid_keys, haversine_km, provider_name
+from yshy.ui import rerun_fragment
+
+# Approximate on-screen size of one cluster cell
+CLUSTER_CELL_PIXELS = 60
+TILE_PIXELS = 256
+
+# Points just outside the viewport are sent too, so small pans don't pop in markers
+VIEWPORT_PADDING = 0.2
+
+MAP_HEIGHT = 450
+
+
+def map_points(candidates, lat, lon, radius_km):
+    """
+    Compact arrays for every unique provider within the radius.
+    Unlike the ranked list this keeps all of them, so the map can show thousands.
+    """
+    if not candidates:
+        return None
+
+    coords = np.array([(candidate[0], candidate[1]) for candidate in candidates], dtype=np.float64)
+    _, first_seen = np.unique(grid_keys(coords[:, 0], coords[:, 1]), return_index=True)
+    first_seen.sort()
+
+    distances = haversine_km(lat, lon, coords[first_seen, 0], coords[first_seen, 1])
+    keep = first_seen[distances <= radius_km]
+    if not len(keep):
+        return None
+
+    return {
+        'lat': coords[keep, 0],
+        'lon': coords[keep, 1],
+        'distance': np.round(distances[distances <= radius_km], 2),
+        'name': [provider_name(candidates[i][2]) for i in keep],
+        'center': (lat, lon),
+        'radius_km': radius_km,
+    }
+
+
+def initial_viewport(points):
+    """Centre and zoom that fit the search radius"""
+    lat, lon = points['center']
+    # Each zoom level halves the visible width; ~40000 km at zoom 0
+    zoom = int(max(3, min(15, math.log2(40000 / (2.5 * points['radius_km'])))))
+    return {'center': (lat, lon), 'zoom': zoom, 'bounds': None}
+
+
+def bounds_mask(points, bounds):
+    """Boolean mask of points inside the (padded) viewport bounds"""
+    if not bounds:
+        return np.ones(len(points['lat']), dtype=bool)
+
+    south, west = bounds['_southWest']['lat'], bounds['_southWest']['lng']
+    north, east = bounds['_northEast']['lat'], bounds['_northEast']['lng']
+    lat_pad = (north - south) * VIEWPORT_PADDING
+    lon_pad = (east - west) * VIEWPORT_PADDING
+    return ((points['lat'] >= south - lat_pad) & (points['lat'] <= north + lat_pad) &
+            (points['lon'] >= west - lon_pad) & (points['lon'] <= east + lon_pad))
+
+
+def cluster_points(points, mask, zoom):
+    """
+    Group visible points into grid cells sized for the zoom level.
+    Returns a list of (lat, lon, count, index) where index is the point's
+    position for single-point clusters and None otherwise.
+    """
+    indices = np.flatnonzero(mask)
+    if not len(indices):
+        return []
+
+    cell = CLUSTER_CELL_PIXELS * 360 / (TILE_PIXELS * 2 ** zoom)
+    lats, lons = points['lat'][indices], points['lon'][indices]
+    _, first, inverse, counts = np.unique(grid_keys(lats, lons, grid=cell), return_index=True,
+                                          return_inverse=True, return_counts=True)
+    centre_lats = np.bincount(inverse, weights=lats) / counts
+    centre_lons = np.bincount(inverse, weights=lons) / counts
+
+    clusters = []
+    for cluster in range(len(counts)):
+        count = int(counts[cluster])
+        index = int(indices[first[cluster]]) if count == 1 else None
+        clusters.append((float(centre_lats[cluster]), float(centre_lons[cluster]), count, index))
+    return clusters
+
+
+def render_provider_map(points, state_key="provider_map_viewport"):
+    """
+    Draw the clustered provider map. folium and streamlit_folium are imported
+    here, so pages only pay for them once a user opens the map.
+    """
+    import folium
+    import streamlit as st
+    from streamlit_folium import st_folium
+
+    viewport = st.session_state.get(state_key) or initial_viewport(points)
+    visible = bounds_mask(points, viewport['bounds'])
+    clusters = cluster_points(points, visible, viewport['zoom'])
+    origin_lat, origin_lon = points['center']
+
+    provider_map = folium.Map(location=list(viewport['center']), zoom_start=viewport['zoom'], prefer_canvas=True)
+    folium.Marker([origin_lat, origin_lon], tooltip="Your search location",
+                  icon=folium.Icon(color="red", icon="home")).add_to(provider_map)
+
+    for cluster_lat, cluster_lon, count, index in clusters:
+        if index is None:
+            folium.Marker(
+                [cluster_lat, cluster_lon],
+                tooltip=f"{count} providers - zoom in to see them",
+                icon=folium.DivIcon(html=(
+                    '<div style="background:#4e89ae;color:white;border-radius:50%;width:32px;height:32px;'
+                    f'line-height:32px;text-align:center;font-weight:bold;">{count}</div>'
+                )),
+            ).add_to(provider_map)
+        else:
+            name = html.escape(points['name'][index])
+            maps_url = (f"https://www.google.com/maps/dir/{origin_lat},{origin_lon}/"
+                        f"{points['lat'][index]},{points['lon'][index]}")
+            folium.Marker(
+                [cluster_lat, cluster_lon],
+                tooltip=name,
+                popup=folium.Popup(f"<b>{name}</b><br>{points['distance'][index]} km away<br>"
+                                   f'<a href="{maps_url}" target="_blank">Get Directions</a>', max_width=250),
+            ).add_to(provider_map)
+
+    st.caption(f"Showing {len(clusters)} markers for {int(visible.sum())} "
+               f"of {len(points['lat'])} providers in view")
+
+    map_state = st_folium(provider_map, height=MAP_HEIGHT, use_container_width=True,
+                          returned_objects=["bounds", "zoom", "center"], key=f"{state_key}_map")
+
+    # Reload markers for the new viewport once the user pans or zooms
+    if has_viewport(map_state):
+        new_viewport = {
+            'center': (map_state['center']['lat'], map_state['center']['lng']),
+            'zoom': int(map_state['zoom']),
+            'bounds': map_state['bounds'],
+        }
+        if viewport_changed(viewport, new_viewport):
+            st.session_state[state_key] = new_viewport
+            rerun_fragment()
+
+
+def has_viewport(map_state):
+    """st_folium reports empty bounds until the map has rendered in the browser"""
+    if not map_state or map_state.get('zoom') is None or not map_state.get('center'):
+        return False
+    bounds = map_state.get('bounds') or {}
+    return bounds.get('_southWest', {}).get('lat') is not None and bounds.get('_northEast', {}).get('lat') is not None
+
+
+def viewport_changed(old, new):
+    if old['bounds'] is None or old['zoom'] != new['zoom']:
+        return True
+    old_corners = [round(old['bounds'][corner][axis], 4) for corner in ('_southWest', '_northEast') for axis in ('lat', 'lng')]
+    new_corners = [round(new['bounds'][corner][axis], 4) for corner in ('_southWest', '_northEast') for axis in ('lat', 'lng')]
+    return old_corners != new_corners
@@ -0,0 +1,70 @@
+"""Coalesce identical in-flight calls so concurrent duplicates share one result"""
+import hashlib
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # The leader was stopped by a BaseException (e.g. a Streamlit rerun)
+        self.interrupted = False
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers arriving while a call for
+    their key is running wait for it and get its result (or its exception)
+    instead of starting their own. Only `Exception`s are shared: when the
+    leader is interrupted by a BaseException, such as a Streamlit rerun of
+    its own session, the waiting callers run the call themselves.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Returns (result, shared); `shared` is True for callers that waited on another's call"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.interrupted:
+                return self.do(key, func)
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.interrupted = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+def fingerprint(*parts):
+    """Stable digest of a request's parts (str or bytes)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
@@ -0,0 +1,171 @@
+"""
+Opt-in work on uploaded images before the analyze button is pressed.
+
+    YSHY_SPECULATIVE=preprocess   # decode, quality-check and downscale on upload
+    YSHY_SPECULATIVE=analyze      # ... and also run the model call
+
+Jobs run in a small background pool while the user reviews the upload, and
+are handed over to the batch when the button is pressed. Nothing is recorded
+or shown until then. Jobs not taken within SPECULATIVE_TTL_SECONDS are
+dropped, and so are a session's jobs when its files change; a job that is
+already running is left to finish, as its call is already paid for. Speculative
+model calls go through the same limiter as batch images, behind interactive
+requests.
+"""
+import concurrent.futures
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from yshy.analysis import analyze_image
+from yshy.images import image_hash, near_duplicates, prepare_image
+from yshy.limiter import BATCH
+from yshy.metrics import inc
+
+MODES = ("off", "preprocess", "analyze")
+MODE = os.getenv("YSHY_SPECULATIVE", "off").lower() or "off"
+if MODE not in MODES:
+    raise ValueError(f"YSHY_SPECULATIVE must be one of {', '.join(MODES)}, not {MODE!r}")
+
+WORKERS = int(os.getenv("YSHY_SPECULATIVE_WORKERS", 2))
+
+# Jobs not taken by then are dropped
+SPECULATIVE_TTL_SECONDS = 5 * 60
+
+# Uploads speculated on per session; its oldest is dropped when it uploads new files
+MAX_SESSION_BATCHES = 1
+
+# Batches remembered across all sessions; beyond this, the least recently
+# started batch with no running job is forgotten
+MAX_SPECULATIVE_BATCHES = 64
+
+
+class SpeculativeBatch:
+    """A session's speculated upload: one future per image number, removed when taken"""
+
+    def __init__(self, session_id, jobs):
+        self.session_id = session_id
+        self.jobs = jobs
+        self.started = time.monotonic()
+
+
+# (session id, batch id) -> SpeculativeBatch; a batch stays after its jobs are
+# taken or dropped so the same upload is not speculated on again
+_batches = OrderedDict()
+_lock = threading.Lock()
+_executor = None
+
+
+def _submit(func, *args):
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="yshy-speculative")
+    # Keep the page's metric labels on the job's stage timings
+    return _executor.submit(contextvars.copy_context().run, func, *args)
+
+
+def _job(image_bytes, mime_type, image_name, number, count, language, session_id):
+    """(prepared image, analysis or None); analysis failures are left to the foreground call"""
+    prepared = prepare_image(image_bytes, mime_type)
+    analysis = None
+    if MODE == "analyze":
+        try:
+            analysis = analyze_image(prepared.data, prepared.mime_type, image_name, number, count, language,
+                                     session=session_id, priority=BATCH)
+        except Exception:
+            inc('yshy_speculative_jobs_total', result="failed")
+    return prepared, analysis
+
+
+def _drop(batch, result):
+    """Cancel the jobs that have not started and forget the finished ones; running jobs stay"""
+    for number, future in list(batch.jobs.items()):
+        if future.cancel() or future.done():
+            del batch.jobs[number]
+            inc('yshy_speculative_jobs_total', result=result)
+
+
+def _running(batch):
+    return any(future.running() for future in batch.jobs.values())
+
+
+def speculate(session_id, batch_id, files, language, skip_duplicates=True):
+    """
+    Start jobs for a session's current upload; does nothing when off or
+    already started. With `skip_duplicates`, only the first image of each
+    group of near-duplicates gets a job, as the batch only analyzes those.
+    """
+    if MODE == "off":
+        return
+    key = (session_id, batch_id)
+    with _lock:
+        now = time.monotonic()
+        for other in _batches.values():
+            if now - other.started >= SPECULATIVE_TTL_SECONDS:
+                _drop(other, "expired")
+        if key in _batches:
+            return
+
+    # Hashed outside the lock; a concurrent run of the same session is checked again below
+    duplicates = set()
+    if skip_duplicates and len(files) > 1:
+        clusters = near_duplicates([image_hash(file.getvalue()) for file in files])
+        duplicates = {number for cluster in clusters for number in cluster[1:]}
+
+    with _lock:
+        if key in _batches:
+            return
+        # The files changed
+        session_keys = [other_key for other_key, other in _batches.items() if other.session_id == session_id]
+        for other_key in session_keys[:max(0, len(session_keys) - MAX_SESSION_BATCHES + 1)]:
+            _drop(_batches.pop(other_key), "discarded")
+        idle = [other_key for other_key, other in _batches.items() if not _running(other)]
+        for other_key in idle[:max(0, len(_batches) - MAX_SPECULATIVE_BATCHES + 1)]:
+            _drop(_batches.pop(other_key), "expired")
+        jobs = {number: _submit(_job, file.getvalue(), file.type, file.name, number, len(files), language, session_id)
+                for number, file in enumerate(files, 1) if number not in duplicates}
+        _batches[key] = SpeculativeBatch(session_id, jobs)
+
+
+def _take(session_id, batch_id, number):
+    with _lock:
+        batch = _batches.get((session_id, batch_id))
+        return batch.jobs.pop(number, None) if batch is not None else None
+
+
+def analyze_upload(session_id, batch_id, number, file, count, language, on_stage=None, on_start=None):
+    """
+    Analysis of image `number` of an upload, taken over from its speculative
+    job when there is one (waiting for it if it is still running), or made
+    now. The result carries the image's quality issues. on_start() is only
+    called when the model call is made here, so a handed-over result is not
+    timed as if it were one.
+    """
+    job = _take(session_id, batch_id, number)
+    if job is not None and job.cancel():
+        # Still waiting for a worker; quicker to do it here
+        inc('yshy_speculative_jobs_total', result="discarded")
+        job = None
+    prepared = analysis = None
+    if job is not None:
+        if not job.done() and on_stage is not None and MODE == "analyze":
+            on_stage("generating")
+        try:
+            prepared, analysis = job.result()
+            if analysis is not None or MODE == "preprocess":
+                inc('yshy_speculative_jobs_total', result="used")
+        except ValueError:
+            # Unreadable image; prepared again below to fail the same way
+            inc('yshy_speculative_jobs_total', result="failed")
+
+    if analysis is None:
+        if on_start is not None:
+            on_start()
+        if prepared is None:
+            prepared = prepare_image(file.getvalue(), file.type)
+        analysis = analyze_image(prepared.data, prepared.mime_type, file.name, number, count, language,
+                                 session=session_id, on_stage=on_stage)
+    analysis["quality_issues"] = prepared.issues
+    return analysis
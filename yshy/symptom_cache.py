@@ -0,0 +1,151 @@
+"""
+Cache for Symptom Checker results, keyed on a canonical form of the input.
+
+Lookups try the exact canonical key first. Optionally (YSHY_SYMPTOM_SIMILARITY),
+a cached result whose structured inputs match exactly and whose description
+is a TF-IDF cosine match at or above that threshold is reused as well.
+
+Entries belong to the session that made them, since a reply can quote the
+user's own details; one session never gets another's result.
+"""
+import math
+import os
+import string
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# Punctuation dropped from descriptions, including the Devanagari danda
+PUNCTUATION = str.maketrans({char: " " for char in string.punctuation + "।॥"})
+
+SymptomKey = namedtuple("SymptomKey", ["language", "text", "duration", "severity", "factors", "session"],
+                        defaults=(None,))
+
+
+def canonical_text(text):
+    """Casefolded description with punctuation removed and whitespace collapsed"""
+    return " ".join(text.casefold().translate(PUNCTUATION).split())
+
+
+def symptom_key(language, text, duration=None, severity=None, factors=()):
+    """
+    Canonical cache key for a symptom check. `duration` is the value given to
+    the model, so a reply is only reused for the duration it was written for;
+    factors are order-insensitive.
+    """
+    return SymptomKey(
+        language,
+        canonical_text(text),
+        str(duration) if duration is not None else None,
+        str(severity) if severity is not None else None,
+        tuple(sorted({canonical_text(factor) for factor in factors})),
+    )
+
+
+def terms(text):
+    """Words and word pairs; the pairs keep "no fever" apart from "fever\""""
+    words = text.split()
+    return Counter(words + [f"{first} {second}" for first, second in zip(words, words[1:])])
+
+
+class SymptomCache:
+    """LRU cache of symptom check results with an optional similarity fallback"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, similarity=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        # key -> (stored_at, result, term counts)
+        self._entries = OrderedDict()
+        # term -> number of cached descriptions containing it
+        self._document_frequency = Counter()
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        _, _, counts = self._entries.pop(key)
+        self._document_frequency.subtract(counts.keys())
+
+    def _expire(self, now):
+        while self._entries:
+            key, (stored_at, _, _) = next(iter(self._entries.items()))
+            if now - stored_at < self.ttl:
+                break
+            self._remove(key)
+
+    def _weights(self, counts, idf):
+        """Unit-length TF-IDF vector; `idf` memoizes the term weights for one lookup"""
+        documents = len(self._entries)
+        weights = {}
+        for term, count in counts.items():
+            if term not in idf:
+                idf[term] = math.log((1 + documents) / (1 + self._document_frequency[term])) + 1
+            weights[term] = count * idf[term]
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def _nearest(self, key):
+        idf = {}
+        query = self._weights(terms(key.text), idf)
+        best_key, best_score = None, 0.0
+        for cached_key, (_, _, counts) in self._entries.items():
+            # Only the free text may differ
+            if cached_key._replace(text=key.text) != key:
+                continue
+            cached = self._weights(counts, idf)
+            score = sum(weight * cached.get(term, 0.0) for term, weight in query.items())
+            if score > best_score:
+                best_key, best_score = cached_key, score
+        if best_key is not None and best_score >= self.similarity:
+            return best_key
+        return None
+
+    def get(self, key):
+        """Returns (result, match) with match "exact" or "similar", or (None, None)"""
+        with self._lock:
+            self._expire(time.monotonic())
+            match = "exact" if key in self._entries else None
+            if match is None and self.similarity:
+                key = self._nearest(key)
+                match = "similar" if key is not None else None
+            if match is None:
+                return None, None
+            self._entries.move_to_end(key)
+            return copy_result(self._entries[key][1]), match
+
+    def put(self, key, result):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            counts = terms(key.text)
+            self._entries[key] = (time.monotonic(), copy_result(result), counts)
+            self._document_frequency.update(counts.keys())
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._document_frequency.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def copy_result(result):
+    return {**result, "conditions": list(result.get("conditions", []))}
+
+
+def cache_from_environment():
+    """
+    YSHY_SYMPTOM_CACHE_SIZE (0 disables the cache), YSHY_SYMPTOM_CACHE_TTL in
+    seconds and YSHY_SYMPTOM_SIMILARITY, the cosine threshold for reusing a
+    near-identical description (unset or 0 disables it).
+    """
+    max_entries = int(os.getenv("YSHY_SYMPTOM_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+    if max_entries <= 0:
+        return None
+    similarity = float(os.getenv("YSHY_SYMPTOM_SIMILARITY", "0")) or None
+    return SymptomCache(max_entries, float(os.getenv("YSHY_SYMPTOM_CACHE_TTL", DEFAULT_TTL_SECONDS)), similarity)
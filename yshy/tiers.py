@@ -0,0 +1,104 @@
+"""
+Model tiers and per-task routing between them.
+
+Each task has an ordered route of tiers. Image analysis uses the full model
+and falls back to the fast tier while the full tier is unhealthy: its p95
+latency over recent calls is above the tier's budget, or too many of them
+fail. Symptom checks are text only and use the fast tier with a smaller
+output budget.
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from yshy.metrics import inc
+
+MODEL_TIERS = {
+    "full": {
+        "model_name": os.getenv("YSHY_FULL_MODEL", "gemini-2.0-flash"),
+        "max_output_tokens": 8192,
+        "p95_seconds": 30.0,
+    },
+    "fast": {
+        "model_name": os.getenv("YSHY_FAST_MODEL", "gemini-2.0-flash-lite"),
+        "max_output_tokens": 4096,
+        "p95_seconds": 15.0,
+    },
+}
+
+# Tiers tried for each task, preferred first
+TASK_ROUTES = {
+    "image": ("full", "fast"),
+    "symptom": ("fast",),
+}
+
+# Recent calls judged per tier, and the fewest needed to judge at all
+HEALTH_WINDOW = 50
+MIN_HEALTH_SAMPLES = 10
+
+MAX_ERROR_RATE = 0.25
+
+# How long an unhealthy tier is skipped before it is tried again
+DEGRADED_SECONDS = 120
+
+
+def is_upstream_error(error):
+    """
+    Whether `error` says the tier itself is unwell: a 5xx response
+    (google.api_core errors carry .code) or a connection failure or timeout.
+    Blocked or empty replies and client errors do not count.
+    """
+    code = getattr(error, "code", None)
+    return (isinstance(code, int) and code >= 500) or isinstance(error, (ConnectionError, TimeoutError))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class TierRouter:
+    """Chooses the tier for each call and skips tiers whose recent calls were slow or failing"""
+
+    def __init__(self, tiers=MODEL_TIERS, routes=TASK_ROUTES):
+        self.tiers = tiers
+        self.routes = routes
+        # tier -> deque of (latency, failed)
+        self._calls = {tier: deque(maxlen=HEALTH_WINDOW) for tier in tiers}
+        self._degraded_until = {tier: 0.0 for tier in tiers}
+        self._lock = threading.Lock()
+
+    def choose(self, task):
+        """The first healthy tier on the task's route, or its last tier when none is"""
+        route = self.routes[task]
+        now = time.monotonic()
+        with self._lock:
+            for tier in route:
+                if self._degraded_until[tier] <= now:
+                    return tier
+        return route[-1]
+
+    def record(self, tier, latency, failed):
+        """Record a call's time in the model, not counting its wait for a slot, and whether it hit an upstream error"""
+        with self._lock:
+            calls = self._calls[tier]
+            calls.append((latency, failed))
+            if len(calls) < MIN_HEALTH_SAMPLES:
+                return
+
+            error_rate = sum(failed for _, failed in calls) / len(calls)
+            latencies = [latency for latency, failed in calls if not failed]
+            reason = None
+            if error_rate > MAX_ERROR_RATE:
+                reason = "errors"
+            elif latencies and percentile(latencies, 0.95) > self.tiers[tier]["p95_seconds"]:
+                reason = "latency"
+            if reason is None:
+                return
+
+            # Start afresh when the tier is tried again
+            calls.clear()
+            self._degraded_until[tier] = time.monotonic() + DEGRADED_SECONDS
+        inc('yshy_model_tier_degraded_total', tier=tier, reason=reason)
@@ -0,0 +1,92 @@
+"""
+Token accounting for Gemini calls and per-task output caps.
+
+Usage metadata from each response is recorded as the yshy_gemini_tokens
+histogram (tagged with the page language and tab) and returned with the
+result, so history entries carry their own token counts.
+
+Output caps start at the tier's maximum and then follow the observed output
+sizes of each task in each language (Devanagari takes several times the
+tokens of the same English text): the 99th percentile plus headroom, within
+the tier's maximum. A response cut off by its cap doubles that cap, and is
+asked for once more at the tier's maximum.
+"""
+import math
+import os
+import threading
+from collections import deque
+
+from yshy.metrics import inc, observe
+from yshy.tiers import percentile
+
+# Recent output sizes per task, and the fewest needed to derive a cap
+OUTPUT_WINDOW = 200
+MIN_OUTPUT_SAMPLES = 20
+
+# Cap = 99th percentile of recent output sizes times this
+OUTPUT_HEADROOM = 1.5
+MIN_OUTPUT_TOKENS = 512
+
+# Count prompt tokens with count_tokens() before each call; one extra round trip
+PREFLIGHT_ENABLED = os.getenv("YSHY_PREFLIGHT_TOKENS", "").lower() in ("1", "true", "yes")
+
+
+class OutputBudget:
+    """Output token caps per task and language, derived from recent responses"""
+
+    def __init__(self):
+        self._outputs = {}
+        # Caps raised after truncation, which the percentile must not undercut
+        self._floors = {}
+        self._lock = threading.Lock()
+
+    def cap(self, task, language, ceiling):
+        key = (task, language)
+        with self._lock:
+            outputs = self._outputs.get(key, ())
+            cap = ceiling
+            if len(outputs) >= MIN_OUTPUT_SAMPLES:
+                cap = max(MIN_OUTPUT_TOKENS, math.ceil(percentile(outputs, 0.99) * OUTPUT_HEADROOM))
+            cap = max(cap, self._floors.get(key, 0))
+        return min(cap, ceiling)
+
+    def record(self, task, language, output_tokens, truncated, cap):
+        key = (task, language)
+        with self._lock:
+            self._outputs.setdefault(key, deque(maxlen=OUTPUT_WINDOW)).append(output_tokens)
+            if truncated:
+                self._floors[key] = max(self._floors.get(key, 0), cap * 2)
+
+
+def response_usage(response):
+    """(prompt tokens, output tokens, truncated) from a response; token counts may be None"""
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    output_tokens = getattr(usage, "candidates_token_count", None)
+    truncated = False
+    for candidate in getattr(response, "candidates", None) or []:
+        reason = getattr(candidate, "finish_reason", None)
+        if getattr(reason, "name", reason) == "MAX_TOKENS":
+            truncated = True
+    return prompt_tokens, output_tokens, truncated
+
+
+def record_usage(kind, tier, prompt_tokens, output_tokens, truncated):
+    """Record a response's usage; returns it as a history entry's "tokens" value"""
+    if prompt_tokens is not None:
+        observe('yshy_gemini_tokens', prompt_tokens, kind=kind, tier=tier, direction="prompt")
+    if output_tokens is not None:
+        observe('yshy_gemini_tokens', output_tokens, kind=kind, tier=tier, direction="output")
+    if truncated:
+        inc('yshy_gemini_truncated_total', kind=kind, tier=tier)
+    return {"prompt": prompt_tokens, "output": output_tokens}
+
+
+def combine_usage(first, second):
+    """Token counts of two calls made for one result; a count missing from both stays None"""
+    return {name: None if first[name] is None and second[name] is None else (first[name] or 0) + (second[name] or 0)
+            for name in ("prompt", "output")}
+
+
+def record_estimate(kind, tier, prompt_tokens):
+    observe('yshy_gemini_tokens', prompt_tokens, kind=kind, tier=tier, direction="prompt_estimate")
@@ -0,0 +1,20 @@
+"""Streamlit helpers shared by the pages"""
+import streamlit as st
+
+
+def fragment(func):
+    """
+    Run `func` as a Streamlit fragment, so widget interactions inside it rerun
+    only that function instead of the whole page script.
+    Falls back to a plain function on Streamlit versions without fragments.
+    """
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return decorator(func) if decorator else func
+
+
+def rerun_fragment():
+    """Rerun only the current fragment, or the whole app outside of one"""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, st.errors.StreamlitAPIException):
+        st.rerun()